@@ -49,7 +49,9 @@ def update_pheromone(tours, distance_matrix, pheromone_matrix, evaporation_rate)
 
 
 
-def aco(distance_matrix, num_ants, max_iterations, alpha=1.0, beta=2.0, evaporation_rate=0.5, initial_pheromone=1.0):
+def aco(distance_matrix, num_ants, max_iterations, alpha=1.0, beta=2.0, evaporation_rate=0.5, initial_pheromone=1.0, local_search=None):
+    # local_search(tour) -> improved tour, applied to every ant's tour before
+    # the pheromone update (e.g. localSearch.tspOptimizer.optimize_tour)
     num_cities=len(distance_matrix)
 
 
@@ -60,6 +62,8 @@ def aco(distance_matrix, num_ants, max_iterations, alpha=1.0, beta=2.0, evaporat
         tours=[]
         for start in ants:
             tour=generate_tour(start, distance_matrix, pheromone_matrix, alpha, beta)
+            if local_search is not None:
+                tour=local_search(tour)
             tours.append(tour)
             if best_tour is None or tour_length(tour, distance_matrix)<tour_length(best_tour, distance_matrix):
                 best_tour=tour
@@ -116,7 +116,7 @@ def mutate_swap(individual, mutation_rate=0.01):
 def state_gen(start_state,n):
     states=[]
     for i in range(n):
-        state = list(range(len(start_state)))
+        state = list(start_state)
         random.shuffle(state)
         states.append(state)
     return states
@@ -153,7 +153,9 @@ def select_parents_tournament(candidates, fitness_func, heuristic, n):
 
 
 
-def genetic_algorithm(start_state, population, heuristic, generations=1000, mutation_rate=0.01, k=2):
+def genetic_algorithm(start_state, population, heuristic, generations=1000, mutation_rate=0.01, k=2, local_search=None):
+    # local_search(tour) -> improved tour, applied to every child after
+    # mutation (e.g. localSearch.tspOptimizer.optimize_tour)
     candidates = state_gen(start_state, population)
     best_offspring = candidates[0]
 
@@ -165,8 +167,12 @@ def genetic_algorithm(start_state, population, heuristic, generations=1000, muta
         while len(next_generation) < population:
             parent1, parent2 = select_parents(candidates, fitness_func, heuristic, 2)
             child1, child2 = crossover_pmx(parent1, parent2)
-            next_generation.append(mutate_inversion(child1, mutation_rate))
-            next_generation.append(mutate_inversion(child2, mutation_rate))
+            child1 = mutate_inversion(child1, mutation_rate)
+            child2 = mutate_inversion(child2, mutation_rate)
+            if local_search is not None:
+                child1, child2 = local_search(child1), local_search(child2)
+            next_generation.append(child1)
+            next_generation.append(child2)
 
         next_generation= sorted(next_generation, key=lambda x: fitness_func(x, heuristic), reverse=True)
 
@@ -16,6 +16,8 @@ import blindSearch.planning.dfid as dfid_planning
 
 # heuristic search
 import heuristic.bfs as bestfs
+import heuristic.idaStar as idastar
+import heuristic.patternDatabase as patterndb
 import localSearch.hillClimbing as hillclimbing
 
 #stochastic search
@@ -23,6 +25,11 @@ import Stochastic.randomWalk as randomwalk
 import Stochastic.simulatedAnnealing as simulatedannealing
 import Stochastic.hillClimbing as stochastichillclimbing
 
+# packed integer board representation
+import extra.movegen.eightpuzzle_packed as packed8
+import extra.movegen.eightpuzzle_move as move8
+from utils.stateKey import identity_key
+
 
 # represents the starting 8 puzzle board configuration
     # [8, 6, 7]
@@ -100,14 +107,33 @@ def heuristic_manhattan(node):
 
 # solution=dfs_planning.dfs_closed(start_node,movegen,goal_test)
 # solution=bfs_planning.bfs_closed(start_node,movegen,goal_test)
+# solution=bfs_planning.bidirectional_bfs(start_node,[1,2,3,4,5,6,7,8,0],movegen)
 
 # solution=dfid_planning.dfid(start_node,movegen,goal_test)
 
+# Planning problem on packed boards (unpack_path turns the path back into lists)
+# solution=packed8.unpack_path(bfs_planning.bfs_closed(packed8.pack(start_node),packed8.movegen,packed8.goal_test,key=identity_key))
+
+# External-memory BFS: layers are kept as sorted files of 6 byte packed boards in the work directory
+# import blindSearch.planning.externalBfs as external_bfs
+# encode,decode=external_bfs.int_codec(6)
+# solution=packed8.unpack_path(external_bfs.external_bfs(packed8.pack(start_node),packed8.movegen,packed8.goal_test,encode,decode,6,"bfs_layers"))
+
+# Batches of boards with the same goal: one backward BFS over all 9! ranks, saved once, then paths by table lookup
+# import blindSearch.planning.distanceOracle as oracle
+# codec=oracle.permutation_codec(9)
+# table=oracle.DistanceOracle.build([[1,2,3,4,5,6,7,8,0]],movegen,codec)
+# table.save("oracle_8puzzle")  # later runs: table=oracle.DistanceOracle.load("oracle_8puzzle",codec)
+# solution=table.path(start_node)
+
 
 
 #Heuristic Search
 # solution=bestfs.bestfirstsearch(start_node,movegen,goal_test,heuristic_hamming)
 # solution=bestfs.bestfirstsearch(start_node,movegen,goal_test,heuristic_manhattan)
+# solution=packed8.unpack_path(bestfs.bestfirstsearch(packed8.pack(start_node),packed8.movegen,packed8.goal_test,packed8.heuristic_manhattan,key=identity_key))
+# solution=packed8.unpack_path(idastar.ida_star(packed8.pack(start_node),packed8.movegen,packed8.goal_test,packed8.heuristic_manhattan,key=identity_key))
+# solution=idastar.ida_star(start_node,movegen,goal_test,patterndb.AdditivePDB(width=3,directory="pdb"))
 # solution=hillclimbing.hillClimbing(start_node,movegen,heuristic_hamming)
 # solution=hillclimbing.hillClimbing(start_node,movegen,heuristic_manhattan)
 
@@ -117,6 +143,8 @@ def heuristic_manhattan(node):
 #Stochastic Search
 # solution=randomwalk.random_walk(start_node,movegen,goal_test,max_steps=10000)
 solution=simulatedannealing.simulated_annealing(start_node,movegen,heuristic_manhattan,max_steps=10000,initial_temp=1.0,cooling_rate=0.95)
+# one random neighbour per proposal, scored incrementally from the current heuristic
+# solution=simulatedannealing.simulated_annealing(start_node,None,heuristic_manhattan,max_steps=10000,initial_temp=1.0,cooling_rate=0.95,random_neighbor=move8.random_neighbor,incremental=move8.manhattan_delta)
 # solution=stochastichillclimbing.stochastic_hill_climbing(start_node,movegen,heuristic_manhattan,max_steps=10000,temperature=0.5)
 
 print("\n")
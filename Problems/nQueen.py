@@ -54,6 +54,10 @@ def goal_test(node):
 
 # solution=dfid.dfid(start_node,movegen,goal_test)
 
+# All solutions, streamed one at a time (40 for n=7, 92 for n=8)
+# for count, board in enumerate(dfs.dfs_all(start_node,movegen,goal_test), 1):
+#     print(f"Solution {count}: {board}")
+
 
 # Planning problem
 
@@ -61,6 +65,7 @@ def goal_test(node):
 solution=bfs_planning.bfs_closed(start_node,movegen,goal_test)
 
 # solution=dfid_planning.dfid(start_node,movegen,goal_test)
+# for path in dfs_planning.dfs_all(start_node,movegen,goal_test): print(path[-1])
 
 
 print(f"\nSolution Path Length: {len(solution)}\n")
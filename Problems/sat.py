@@ -19,6 +19,10 @@ import blindSearch.planning.dfid as dfid_planning
 import heuristic.bfs as bestfs
 
 
+#stochastic search
+import Stochastic.simulatedAnnealing as simulatedannealing
+import extra.movegen.sat_move as sat_move
+
 #Genetic Algorithm
 import Genetic.sat as ga_sat
 
@@ -92,6 +96,12 @@ def heuristic(node):
 # solution=bestfs.bestfirstsearch(start_node,movegen,goal_test,heuristic)
 
 
+#Stochastic Local Search
+# the formula of goal_test as clauses; incremental rescoring touches only the flipped variable's clauses
+# clauses=sat_move.UnsatisfiedClauses([[1,-2],[-1,3],[2,4],[3,-5],[-4,-5]])
+# solution=simulatedannealing.simulated_annealing(start_node,None,clauses,1000,2,0.99,random_neighbor=sat_move.random_neighbor,incremental=clauses.incremental)
+
+
 # Genetic Algorithm
 solution=ga_sat.genetic_algorithm(start_node, population=5, heuristic=heuristic, generations=1000, mutation_rate=0.1, k=2)
 
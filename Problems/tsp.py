@@ -158,29 +158,57 @@ def movegen2(node):
     print(f"{x} : {heuristic(x)}" for x in childerens)
     return childerens
 
+# move objects with O(1) cost deltas, a tour is only built for the accepted move
+import extra.movegen.tsp_move as tsp_move
+dist = tsp_move.city_matrix(graph)
+def moves(node):
+    return tsp_move.two_opt_moves(node, dist)
+def random_move(node, rng):
+    return tsp_move.random_two_opt_move(node, dist, rng)
+
+# 2-opt/Or-opt over the 8 nearest neighbours of every city, with don't-look bits
+import localSearch.tspOptimizer as tsp_opt
+neighbours = tsp_opt.candidate_lists(dist, start_node, k=8)
+def optimize(node):
+    return tsp_opt.optimize_tour(node, dist, neighbours)
+
 #Heuristic Search -Local Search
 solution=hillclimbing.hillClimbing(start_node,movegen2,heuristic)
+# solution=optimize(tsp_opt.nearest_neighbour_tour(dist, start_node, neighbours))
+# solution=hillclimbing.hillClimbing(start_node,None,heuristic,moves=moves)
+# solution=hillclimbing.hillClimbing(start_node,tsp_move.iter_two_opt,heuristic,first_improvement=True)
+# solution=hillclimbing.hillClimbing(start_node,None,heuristic,moves=moves,first_improvement=True)
+# solution=hillclimbing.hillClimbing(start_node,lambda node: tsp_move.sample_three_opt(node,100),heuristic)
 
 # solution=iter_hillclimb.iteratedHillClimbing(movegen,heuristic,state_generator,50)
+# solution=iter_hillclimb.iteratedHillClimbing(None,heuristic,state_generator,50,moves=moves)
 
 # solution=tabusearch.tabuSearch(start_node,movegen,heuristic,50)
+# solution=tabusearch.tabuSearch(start_node,None,heuristic,200,moves=moves,tenure=10)
 # solution=beamsearch.beamSearch(start_node,movegen,heuristic,5,200)
+# solution=beamsearch.beamSearch(start_node,movegen,heuristic,50,200,closed_limit=200000,stochastic=True,temperature=20)
 
 
 
 #stochastic Local Search
 # solution=randomwalk.random_walk(start_node,movegen,heuristic,10000)
 # solution=simulatedannealing.simulated_annealing(start_node,movegen,heuristic,1000,100,0.995)
+# solution=simulatedannealing.simulated_annealing(start_node,movegen,heuristic,1000,100,0.995,cache=True)
+# solution=simulatedannealing.simulated_annealing(start_node,None,heuristic,1000,100,0.995,random_move=random_move)
+# solution=simulatedannealing.simulated_annealing(start_node,None,heuristic,1000,100,0.995,random_neighbor=tsp_move.random_neighbor)
+# solution=simulatedannealing.simulated_annealing(start_node,None,heuristic,3000,random_move=random_move,schedule=simulatedannealing.ReheatingCooling(100,0.995,patience=200))
 # solution=stochastichillclimbing.stochastic_hill_climbing(start_node,movegen,heuristic,1000,0.4)
 
 
 #Genetic Algorithm
 # solution=ga_tsp.genetic_algorithm(start_node, population=10, heuristic=heuristic, generations=1000, mutation_rate=0.2, k=2)
+# solution=ga_tsp.genetic_algorithm(start_node, population=10, heuristic=heuristic, generations=50, mutation_rate=0.2, k=2, local_search=optimize)
 
 
 #ACO
 
 # solution=aco.aco(distance_matrix=graph, num_ants=20, max_iterations=1000, alpha=2.0, beta=2.0, evaporation_rate=0.3, initial_pheromone=1.0)
+# solution=aco.aco(distance_matrix=graph, num_ants=20, max_iterations=50, alpha=2.0, beta=2.0, evaporation_rate=0.3, initial_pheromone=1.0, local_search=optimize)
 
 
 
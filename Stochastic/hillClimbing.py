@@ -1,11 +1,14 @@
 import random
 import math
 
+from utils.heuristicCache import resolve_cache
 
 
 
 
-def stochastic_hill_climbing(start_node, movegen, heuristic, max_steps=1000, temperature=0.5):
+
+def stochastic_hill_climbing(start_node, movegen, heuristic, max_steps=1000, temperature=0.5, cache=None):
+    heuristic = resolve_cache(heuristic, cache)
     current_node = start_node
     best_node = start_node
     for step in range(max_steps):
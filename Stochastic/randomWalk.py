@@ -1,7 +1,10 @@
 import random
 
+from utils.heuristicCache import resolve_cache
 
-def random_walk(start_node,movegen,heuristic,max_steps=1000):
+
+def random_walk(start_node,movegen,heuristic,max_steps=1000,cache=None):
+    heuristic=resolve_cache(heuristic,cache)
     current_node=start_node
     best_node=start_node
     for step in range(max_steps):
@@ -1,29 +1,151 @@
 import random
 import math
 
+from utils.searchStats import reports_stats
+from utils.heuristicCache import resolve_cache
+
 
 def cooling_funtion(initial_temp, cooling_rate, step):
     return initial_temp * (cooling_rate**step)
 
 
-def simulated_annealing(start_node, movegen, heuristic, max_steps=1000, initial_temp=100, cooling_rate=0.95):
+class GeometricCooling:
+    """T = initial_temp * cooling_rate**step.
+
+    A cooling schedule holds the current temperature, is told about every
+    proposal through observe(accepted, improved) and moves on one step with
+    cool()."""
+
+    def __init__(self, initial_temp=100, cooling_rate=0.95):
+        self.initial_temp = initial_temp
+        self.cooling_rate = cooling_rate
+        self.step = 0
+        self.temperature = initial_temp
+
+    def observe(self, accepted, improved):
+        pass
+
+    def cool(self):
+        self.step += 1
+        self.temperature = cooling_funtion(self.initial_temp, self.cooling_rate, self.step)
+
+
+class AdaptiveCooling(GeometricCooling):
+    """Cools by cooling_rate while more than `target` of the proposals since
+    the last step were accepted (the hot, random walk phase), and only by
+    cooling_rate**slowdown once fewer are, so more of the run is spent at
+    the temperatures where the search is selective."""
+
+    def __init__(self, initial_temp=100, cooling_rate=0.95, target=0.5, slowdown=0.25):
+        super().__init__(initial_temp, cooling_rate)
+        self.target = target
+        self.slowdown = slowdown
+        self.proposals = 0
+        self.accepted = 0
+
+    def observe(self, accepted, improved):
+        self.proposals += 1
+        self.accepted += accepted
+
+    def cool(self):
+        self.step += 1
+        rate = self.cooling_rate
+        if self.proposals and self.accepted <= self.target*self.proposals:
+            rate **= self.slowdown
+        self.temperature *= rate
+        self.proposals = self.accepted = 0
+
+
+class ReheatingCooling(GeometricCooling):
+    """Geometric cooling, but after `patience` steps without a new best node
+    the temperature goes back up to reheat * initial_temp."""
+
+    def __init__(self, initial_temp=100, cooling_rate=0.95, patience=200, reheat=0.5):
+        super().__init__(initial_temp, cooling_rate)
+        self.patience = patience
+        self.reheat = reheat
+        self.stale = 0
+
+    def observe(self, accepted, improved):
+        if improved:
+            self.stale = -1  # cool() of this step brings it to 0
+
+    def cool(self):
+        self.step += 1
+        self.stale += 1
+        if self.stale >= self.patience:
+            self.stale = 0
+            self.temperature = self.reheat*self.initial_temp
+        else:
+            self.temperature *= self.cooling_rate
+
+
+@reports_stats(movegen="movegen", heuristic="heuristic", sample=("random_move", "random_neighbor"))
+def simulated_annealing(start_node, movegen, heuristic, max_steps=1000, initial_temp=100, cooling_rate=0.95, stats=None, cache=None,
+                        random_move=None, random_neighbor=None, incremental=None, schedule=None, rng=None):
+    """Simulated annealing; returns the best node seen.
+
+    Every step proposes random neighbours until one is accepted (at most
+    max_steps//10 of them) and then cools. A proposal that is worse by
+    delta is accepted with probability exp(-delta/T) (Metropolis). The cost
+    of the current node is carried along, so each proposal costs one
+    evaluation of the neighbour at most:
+
+    random_move(node, rng)      one random move object (move.delta,
+                                move.apply(node); see extra/movegen/tsp_move.py):
+                                no evaluation, and the neighbour is only built
+                                once it is accepted
+    random_neighbor(node, rng)  one random neighbour (random_neighbor in the
+                                extra/movegen modules), scored by heuristic or
+                                by incremental(node, h, child) -> h(child)
+    movegen(node)               otherwise, the whole neighbourhood is built to
+                                pick one of it
+
+    schedule is a cooling schedule (GeometricCooling, the default, from
+    initial_temp and cooling_rate, AdaptiveCooling or ReheatingCooling);
+    rng defaults to the random module.
+    """
+    heuristic = resolve_cache(heuristic, cache)
+    rng = rng or random
+    if schedule is None:
+        schedule = GeometricCooling(initial_temp, cooling_rate)
     current_node = start_node
-    best_node = start_node
-    temperature = initial_temp
+    cost = heuristic(start_node)
+    best_node, best_cost = current_node, cost
     for step in range(1,max_steps):
+        temperature = schedule.temperature
         n= max_steps // 10
         while n>0:
             n-=1
-            neighbors = movegen(current_node)
-            if not neighbors:
-                return best_node
-            next_node = random.choice(neighbors)
-            delta_e = heuristic(current_node) - heuristic(next_node)
-            if random.uniform(0, 1) < 1/(1+math.exp(min(700,-delta_e / temperature))):
-                current_node = next_node
-                if heuristic(current_node) < heuristic(best_node):
-                    best_node = current_node
+            if random_move is not None:
+                move = random_move(current_node, rng)
+                if move is None:
+                    return best_node
+                delta = move.delta
+            else:
+                if random_neighbor is not None:
+                    next_node = random_neighbor(current_node, rng)
+                    if next_node is None:
+                        return best_node
+                else:
+                    neighbors = movegen(current_node)
+                    if not neighbors:
+                        return best_node
+                    next_node = rng.choice(neighbors)
+                if incremental is not None:
+                    delta = incremental(current_node, cost, next_node) - cost
+                else:
+                    delta = heuristic(next_node) - cost
+            accepted = delta <= 0 or (temperature > 0 and rng.random() < math.exp(-delta / temperature))
+            improved = False
+            if accepted:
+                current_node = move.apply(current_node) if random_move is not None else next_node
+                cost += delta
+                if cost < best_cost:
+                    best_node, best_cost = current_node, cost
+                    improved = True
+            schedule.observe(accepted, improved)
+            if accepted:
                 break
-            
-            temperature= cooling_funtion(initial_temp, cooling_rate, step)
-    return best_node
\ No newline at end of file
+        schedule.cool()
+    return best_node
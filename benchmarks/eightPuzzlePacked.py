@@ -0,0 +1,86 @@
+"""Compare the list and packed-integer 8-puzzle representations on a batch of
+random instances with the planning bfs/dfs and best-first engines.
+
+Run:
+    python benchmarks/eightPuzzlePacked.py [instances] [scramble_moves]
+"""
+import sys
+import os
+import io
+import time
+import random
+import contextlib
+# Add parent directory to Python path so we can import from blindSearch
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import blindSearch.planning.bfs as bfs_planning
+import blindSearch.planning.dfs as dfs_planning
+import heuristic.bfs as bestfs
+from extra.movegen import eightpuzzle_move
+from extra.movegen import eightpuzzle_packed as packed
+from utils.stateKey import identity_key
+
+
+GOAL_BOARD = [1,2,3,4,5,6,7,8,0]
+
+
+def goal_test(node):
+    return node == GOAL_BOARD
+
+
+def heuristic_manhattan(node):
+    score = 0
+    for i in range(9):
+        value = node[i]
+        if value != 0:
+            goal_index = value-1
+            score += abs(i//3-goal_index//3) + abs(i%3-goal_index%3)
+    return score
+
+
+def instances(count, moves, seed=0):
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        node = GOAL_BOARD[:]
+        for _ in range(moves):
+            node = rng.choice(eightpuzzle_move.standard_moves(node))
+        boards.append(node)
+    return boards
+
+
+def run(name, solve, boards):
+    begin = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        lengths = [len(solve(board)) for board in boards]
+    elapsed = time.perf_counter() - begin
+    print(f"  {name:<8} {elapsed:7.2f}s")
+    return lengths, elapsed
+
+
+def compare(title, list_solver, packed_solver, boards):
+    print(title)
+    list_lengths, list_time = run("list", list_solver, boards)
+    packed_lengths, packed_time = run("packed", packed_solver, boards)
+    assert list_lengths == packed_lengths
+    print(f"  speedup  {list_time/packed_time:7.2f}x")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    moves = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    boards = instances(count, moves)
+    print(f"{count} instances, {moves} random moves from the goal\n")
+
+    compare("bfs_closed",
+            lambda b: bfs_planning.bfs_closed(b, eightpuzzle_move.standard_moves, goal_test),
+            lambda b: bfs_planning.bfs_closed(packed.pack(b), packed.movegen, packed.goal_test, key=identity_key),
+            boards)
+    compare("dfs_closed",
+            lambda b: dfs_planning.dfs_closed(b, eightpuzzle_move.standard_moves, goal_test),
+            lambda b: dfs_planning.dfs_closed(packed.pack(b), packed.movegen, packed.goal_test, key=identity_key),
+            boards)
+    compare("bestfirstsearch (manhattan)",
+            lambda b: bestfs.bestfirstsearch(b, eightpuzzle_move.standard_moves, goal_test, heuristic_manhattan),
+            lambda b: bestfs.bestfirstsearch(packed.pack(b), packed.movegen, packed.goal_test, packed.heuristic_manhattan, key=identity_key),
+            boards)
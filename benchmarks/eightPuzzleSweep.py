@@ -0,0 +1,45 @@
+"""Exhaust the 8-puzzle state space with the Configuration bfs/dfs engines.
+
+The start board is the one used in Problems/8Puzzle.py and the move generator
+is the same blank-swap generator (extra/movegen/eightpuzzle_move.py). The goal
+test never succeeds, so each engine has to visit all 9!/2 = 181440 reachable
+boards before returning False.
+
+Run:
+    python benchmarks/eightPuzzleSweep.py
+"""
+import sys
+import os
+import time
+# Add parent directory to Python path so we can import from blindSearch
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import blindSearch.Configuration.bfs as bfs
+import blindSearch.Configuration.dfs as dfs
+from extra.movegen.eightpuzzle_move import standard_moves
+
+
+REACHABLE_STATES = 181440
+
+start_node = [8,6,7,2,5,4,3,0,1]
+
+
+def sweep(name, engine):
+    visited = 0
+
+    def goal_test(node):
+        nonlocal visited
+        visited += 1
+        return False
+
+    begin = time.perf_counter()
+    result = engine(start_node, standard_moves, goal_test)
+    elapsed = time.perf_counter() - begin
+    assert result is False
+    assert visited == REACHABLE_STATES, visited
+    print(f"{name}: visited {visited} states in {elapsed:.2f}s ({visited/elapsed:,.0f} states/s)")
+
+
+if __name__ == "__main__":
+    sweep("bfs_closed", bfs.bfs_closed)
+    sweep("dfs_closed", dfs.dfs_closed)
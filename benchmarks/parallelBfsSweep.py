@@ -0,0 +1,42 @@
+"""Full 8-puzzle sweep (181440 packed boards) with the serial and the parallel
+planning BFS, for a range of worker counts.
+
+Run:
+    python benchmarks/parallelBfsSweep.py [max_workers]
+"""
+import sys
+import os
+import io
+import time
+import contextlib
+import multiprocessing as mp
+# Add parent directory to Python path so we can import from blindSearch
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import blindSearch.planning.bfs as bfs_planning
+import blindSearch.planning.parallelBfs as parallel_bfs
+from extra.movegen import eightpuzzle_packed as packed
+from utils.stateKey import identity_key
+
+
+def never(state):
+    return False
+
+
+if __name__ == "__main__":
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else mp.cpu_count()
+    start = packed.pack([8,6,7,2,5,4,3,0,1])
+
+    begin = time.perf_counter()
+    bfs_planning.bfs_closed(start, packed.movegen, never, key=identity_key)
+    serial = time.perf_counter()-begin
+    print(f"bfs_closed          {serial:6.2f}s")
+
+    workers = 1
+    while workers <= max_workers:
+        begin = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            parallel_bfs.parallel_bfs(start, packed.movegen, never, key=identity_key, workers=workers)
+        elapsed = time.perf_counter()-begin
+        print(f"parallel_bfs x{workers:<3}   {elapsed:6.2f}s  speedup {serial/elapsed:5.2f}x")
+        workers *= 2
@@ -1,33 +1,64 @@
+from collections import deque
+from utils.stateKey import resolve_key
+from utils.searchStats import reports_stats
+
+
 def bfs(start_state,movegen,goal_test):
-    open=[start_state]
+    open=deque([start_state])
     while open:
-        node = open[0]
-        open = open[1:]
+        node = open.popleft()
         if goal_test(node):
             return node
         else:
-            open=open+movegen(node)
+            open.extend(movegen(node))
     return False
 
 
-def bfs_closed(start_state,movegen,goal_test):
-    open=[start_state]
-    closed=[]
+@reports_stats(movegen="movegen",goal_test="goal_test")
+def bfs_closed(start_state,movegen,goal_test,key=None,stats=None,verbose=False):
+    key=resolve_key(key)
+    open=deque([start_state])
+    seen={key(start_state)}  # keys of every state already in open or closed
     depth=0
     temp=1
     while open:
         if(temp==0):
             depth+=1
-            print(f"Exploring depth: {depth}")
+            if verbose:
+                print(f"Exploring depth: {depth}")
             temp=len(open)
         temp-=1
-        node = open[0]
-        open = open[1:]
-        closed.append(node)
+        node = open.popleft()
         if goal_test(node):
             return node
         else:
-            childs=movegen(node)
-            childs=[child for child in childs if child not in closed and child not in open]
-            open.extend(childs)
-    return False
\ No newline at end of file
+            for child in movegen(node):
+                child_key=key(child)
+                if child_key not in seen:
+                    seen.add(child_key)
+                    open.append(child)
+                elif stats is not None:
+                    stats.duplicates_pruned+=1
+            if stats is not None:
+                stats.observe(len(open),len(seen)-len(open))
+    return False
+
+
+def bfs_all(start_state,movegen,goal_test,key=None):
+    """Yield every goal state reachable from start_state, shallowest first.
+
+    Each state is yielded at most once. Memory is the open queue plus the keys
+    of the states seen so far; use dfs.dfs_all when that is too much.
+    """
+    key=resolve_key(key)
+    open=deque([start_state])
+    seen={key(start_state)}
+    while open:
+        node = open.popleft()
+        if goal_test(node):
+            yield node
+        for child in movegen(node):
+            child_key=key(child)
+            if child_key not in seen:
+                seen.add(child_key)
+                open.append(child)
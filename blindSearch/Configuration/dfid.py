@@ -1,35 +1,45 @@
+from utils.stateKey import resolve_key
+from utils.searchStats import reports_stats
 
 
 #depth limited search
-def dls(node, movegen, goal_test, depth):
-    open=[]
-    open.append((node, 0))  # (state, current_depth)
-    closed=[]
+def dls(node, movegen, goal_test, depth, key=None, stats=None):
+    key=resolve_key(key)
+    open=[(node, 0)]  # (state, current_depth), list used as a stack
+    seen={key(node)}  # keys of every state already in open or closed
     while open:
-        nodePair = open[0]
-        node, current_depth = nodePair
+        node, current_depth = open.pop()
         if(goal_test(node)):
             return node
-        closed.append(node)
         if current_depth < depth:
-            childs=movegen(node)
-            childs=[child for child in childs if child not in closed and child not in [n for n, d in open]]
-            open=[(child, current_depth + 1) for child in childs] + open[1:]
-        else:
-            open=open[1:]   
+            childs=[]
+            for child in movegen(node):
+                child_key=key(child)
+                if child_key not in seen:
+                    seen.add(child_key)
+                    childs.append((child, current_depth + 1))
+                elif stats is not None:
+                    stats.duplicates_pruned+=1
+            open.extend(reversed(childs))
+            if stats is not None:
+                stats.observe(len(open),len(seen)-len(open))
     return False
 
 
 
 
 
-def dfid(start_state, movegen, goal_test):
+@reports_stats(movegen="movegen",goal_test="goal_test")
+def dfid(start_state, movegen, goal_test, key=None, stats=None, verbose=False):
+    key=resolve_key(key)
     depth = 0
     while True:
-        print(f"Exploring depth: {depth}")
-        result = dls(start_state, movegen, goal_test, depth)
+        if verbose:
+            print(f"Exploring depth: {depth}")
+        expanded = stats.nodes_expanded if stats is not None else 0
+        result = dls(start_state, movegen, goal_test, depth, key, stats)
+        if stats is not None:
+            stats.iterations.append({"depth": depth, "nodes_expanded": stats.nodes_expanded-expanded})
         if result is not False:
             return result
         depth += 1
-
-
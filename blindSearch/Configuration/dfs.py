@@ -1,25 +1,75 @@
+from utils.stateKey import resolve_key
+from utils.pathWalk import PathWalk
+from utils.searchStats import reports_stats
+
+
 def dfs(start_state,movegen,goal_test):
+    # list used as a stack, children pushed reversed so the first child is popped first
     open=[start_state]
     while open:
-        node = open[0]
-        open = open[1:]
+        node = open.pop()
         if goal_test(node):
             return node
         else:
-            open=movegen(node)+open
+            open.extend(reversed(movegen(node)))
     return False
 
-def dfs_closed(start_state,movegen,goal_test):
+@reports_stats(movegen="movegen",goal_test="goal_test")
+def dfs_closed(start_state,movegen,goal_test,key=None,stats=None):
+    key=resolve_key(key)
     open=[start_state]
-    closed=[]
+    seen={key(start_state)}  # keys of every state already in open or closed
     while open:
-        node = open[0]
-        open = open[1:]
-        closed.append(node)
+        node = open.pop()
         if goal_test(node):
             return node
         else:
-            childs=movegen(node)
-            childs=[child for child in childs if child not in closed and child not in open]
-            open=childs+open
-    return False
\ No newline at end of file
+            childs=[]
+            for child in movegen(node):
+                child_key=key(child)
+                if child_key not in seen:
+                    seen.add(child_key)
+                    childs.append(child)
+                elif stats is not None:
+                    stats.duplicates_pruned+=1
+            open.extend(reversed(childs))
+            if stats is not None:
+                stats.observe(len(open),len(seen)-len(open))
+    return False
+
+
+def dfs_all(start_state,movegen,goal_test,key=None,closed=False):
+    """Yield every goal state reachable from start_state, depth first.
+
+    Only the current path is kept: one iterator over the children of every
+    state on it, and their keys to skip children that would close a cycle, so
+    memory is O(b*depth) and the caller may stop at any point. In a graph a goal
+    reached along several paths is yielded once per path; closed=True also keeps
+    the keys of every visited state to yield each goal once, at the price of
+    memory that grows with the states visited.
+    """
+    key=resolve_key(key)
+    start_key=key(start_state)
+    seen={start_key} if closed else None
+    if goal_test(start_state):
+        yield start_state
+    keys=[start_key]
+    on_path={start_key}
+
+    def backtrack():
+        on_path.discard(keys.pop())
+
+    walk=PathWalk(movegen(start_state),backtrack)
+    for child in walk:
+        child_key=key(child)
+        if child_key in on_path:
+            continue
+        if seen is not None:
+            if child_key in seen:
+                continue
+            seen.add(child_key)
+        if goal_test(child):
+            yield child
+        keys.append(child_key)
+        on_path.add(child_key)
+        walk.descend(movegen(child))
@@ -1,47 +1,112 @@
 from collections import deque
-def findLink(node,closed):
-    # Convert 2D list to hashable tuple of tuples
-    node_key = tuple(node)
-    if node_key in closed:
-        return (node,closed[node_key])
-    return None 
+from utils.stateKey import resolve_key, identity_key
+from utils.nodeStore import NodeStore
+from utils.searchStats import reports_stats
 
 
-def reconstruct_path(nodePair,closed):
-    node,parent=nodePair
-    path=[]
-    path.append(node)
-    while parent is not None:
-        path.append(parent)
-        node,parent=findLink(parent,closed)
-    return path[::-1]
 
 
+@reports_stats(movegen="movegen",goal_test="goal_test")
+def bfs_closed(start_state,movegen,goal_test,key=None,decode=None,stats=None):
+    key=resolve_key(key)
+    store=NodeStore(key,decode)
+    ids=store.ids
+    add=store.add
+    own_key=key is identity_key  # e.g. packed boards: no key call per child
+    open=deque([(start_state,store.add(start_state,key(start_state)))])
+    while open:
+
+        node,node_id = open.popleft()
+        if goal_test(node):
+            return store.path(node_id)
+        else:
+            for child in movegen(node):
+                child_key=child if own_key else key(child)
+                if child_key not in ids:
+                    open.append((child,add(child,child_key,node_id)))
+                elif stats is not None:
+                    stats.duplicates_pruned+=1
+            if stats is not None:
+                stats.observe(len(open),len(store)-len(open))
+    return False
 
 
-def bfs_closed(start_state,movegen,goal_test):
-    open=deque([(start_state,None)])
+def expand_layer(layer,movegen,key,store,other,stats=None):
+    # expand every node of one BFS layer; stop as soon as a child is already
+    # known to the search running from the other end
+    next_layer=[]
+    ids=store.ids
+    for node,node_id in layer:
+        for child in movegen(node):
+            child_key=key(child)
+            if child_key not in ids:
+                child_id=store.add(child,child_key,node_id)
+                if child_key in other:
+                    return next_layer,child_key
+                next_layer.append((child,child_id))
+            elif stats is not None:
+                stats.duplicates_pruned+=1
+    return next_layer,None
 
-    # set for O(1) set membership lookup
-    open_set = {tuple(start_state)}
 
-    closed={}
-    while open:
+def splice_path(meet_key,forward,backward):
+    # start .. meet from the forward parents, then meet .. goal from the backward ones
+    path=forward.path(forward.get(meet_key))
+    path.extend(reversed(backward.path(backward.get(meet_key))[:-1]))
+    return path
 
-        nodePair = open.popleft()
-        node = nodePair[0] 
-        open_set.remove(tuple(node)) 
 
-        node_key = tuple(node)
-        closed[node_key] = nodePair[1]
-        if goal_test(node):
-            return reconstruct_path(nodePair,closed)
+@reports_stats(movegen=("movegen","predecessors"))
+def bidirectional_bfs(start_state,goal_state,movegen,predecessors=None,key=None,decode=None,stats=None):
+    """Breadth-first search from both ends, for domains with an explicit goal state.
+
+    predecessors(state) lists the states that reach `state` in one move; it
+    defaults to movegen, which is right for reversible domains (8-puzzle,
+    missionaries/cannibals, wolf/goat/cabbage). Pouring in the water jug is not
+    reversible, use extra/movegen/waterjug_move.classic_predecessors there. The smaller frontier is
+    expanded one full layer at a time until the two searches meet, and the path
+    is returned start to goal like bfs_closed, or False if there is none.
+    """
+    key=resolve_key(key)
+    if predecessors is None:
+        predecessors=movegen
+    start_key=key(start_state)
+    goal_key=key(goal_state)
+    if start_key==goal_key:
+        return [start_state]
+
+    forward=NodeStore(key,decode)
+    backward=NodeStore(key,decode)
+    forward_layer=[(start_state,forward.add(start_state,start_key))]
+    backward_layer=[(goal_state,backward.add(goal_state,goal_key))]
+    while forward_layer and backward_layer:
+        if len(forward_layer)<=len(backward_layer):
+            forward_layer,meet_key=expand_layer(forward_layer,movegen,key,forward,backward,stats)
         else:
-            childs=movegen(node)
+            backward_layer,meet_key=expand_layer(backward_layer,predecessors,key,backward,forward,stats)
+        if stats is not None:
+            stats.observe(len(forward_layer)+len(backward_layer),len(forward)+len(backward))
+        if meet_key is not None:
+            return splice_path(meet_key,forward,backward)
+    return False
+
 
-            # Check if child is already in closed or open using proper hashable representation
-            childs=[child for child in childs if tuple(child) not in closed and tuple(child) not in open_set]
+def bfs_all(start_state,movegen,goal_test,key=None,decode=None):
+    """Yield the path to every goal reachable from start_state, shortest first.
 
-            open.extend([(child,node) for child in childs])
-            open_set.update(tuple(child) for child in childs)
-    return False
\ No newline at end of file
+    Each goal is yielded once, with a shortest path to it. Every generated
+    state stays in the node store to rebuild paths; use dfs.dfs_all when the
+    state space is too large for that.
+    """
+    key=resolve_key(key)
+    store=NodeStore(key,decode)
+    ids=store.ids
+    open=deque([(start_state,store.add(start_state,key(start_state)))])
+    while open:
+        node,node_id = open.popleft()
+        if goal_test(node):
+            yield store.path(node_id)
+        for child in movegen(node):
+            child_key=key(child)
+            if child_key not in ids:
+                open.append((child,store.add(child,child_key,node_id)))
@@ -1,49 +1,76 @@
-def findLink(node,closed):
-    if node == closed[0][0]:
-        return closed[0]
-    else:
-        return findLink(node,closed[1:])
-
-
-def reconstruct_path(nodePair,closed):
-    node,_,parent=nodePair
-    path=[]
-    path.append(node)
-    while parent is not None:
-        path.append(parent)
-        node,_,parent=findLink(parent,closed)
-    return path[::-1]
+from utils.stateKey import resolve_key
+from utils.pathWalk import PathWalk
+from utils.searchStats import reports_stats
+
 
 #depth limited search
-def dls(node, movegen, goal_test, depth):
-    open=[]
-    open.append((node, 0,None))  # (state, current_depth)
-    closed=[]
-    while open:
-        nodePair = open[0]
-        node, current_depth, _ = nodePair
-        if(goal_test(node)):
-            return reconstruct_path(nodePair,closed)
-        closed.append(nodePair)
-        if current_depth < depth:
-            childs=movegen(node)
-            childs=[child for child in childs if child not in [n for n,d,p in closed] and child not in [n for n, d, p in open]]
-            open=[(child, current_depth + 1, node) for child in childs] + open[1:]
+def dls(start_state, movegen, goal_test, depth, key=None, stats=None):
+    """Depth-first search below start_state down to `depth` moves.
+
+    Only the current path is kept (see utils/pathWalk.py): `path` holds the
+    states and `on_path` their keys, a child already on the path would close a
+    cycle and is skipped. Memory is O(b*depth) whatever the size of the state
+    space.
+
+    Returns (path or False, nodes expanded, cutoff) where cutoff tells whether
+    some state was left unexpanded because it sat on the depth limit.
+    """
+    key=resolve_key(key)
+    if goal_test(start_state):
+        return [start_state], 0, False
+    if depth == 0:
+        return False, 0, True
+
+    path=[start_state]
+    keys=[key(start_state)]
+    on_path=set(keys)
+
+    def backtrack():
+        on_path.discard(keys.pop())
+        path.pop()
+
+    walk=PathWalk(movegen(start_state),backtrack)
+    expanded=1
+    cutoff=False
+    for child in walk:
+        child_key=key(child)
+        if child_key in on_path:
+            if stats is not None:
+                stats.duplicates_pruned+=1
+            continue
+        if goal_test(child):
+            path.append(child)
+            return path, expanded, cutoff
+        # the child sits at depth len(path)
+        if len(path) < depth:
+            path.append(child)
+            keys.append(child_key)
+            on_path.add(child_key)
+            walk.descend(movegen(child))
+            expanded+=1
+            if stats is not None:
+                stats.observe(len(path),len(on_path))
         else:
-            open=open[1:]   
-    return False
+            cutoff=True
+    return False, expanded, cutoff
 
 
 
 
 
-def dfid(start_state, movegen, goal_test):
+@reports_stats(movegen="movegen", goal_test="goal_test")
+def dfid(start_state, movegen, goal_test, key=None, stats=None, verbose=False):
+    key=resolve_key(key)
     depth = 0
     while True:
-        print(f"Exploring depth: {depth}")
-        result = dls(start_state, movegen, goal_test, depth)
+        result, expanded, cutoff = dls(start_state, movegen, goal_test, depth, key, stats)
+        if verbose:
+            print(f"Exploring depth: {depth}, nodes expanded: {expanded}")
+        if stats is not None:
+            stats.iterations.append({"depth": depth, "nodes_expanded": expanded})
         if result is not False:
             return result
+        # nothing was cut off by the limit, so a deeper pass cannot find more
+        if not cutoff:
+            return False
         depth += 1
-
-
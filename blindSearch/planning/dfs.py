@@ -1,38 +1,63 @@
-from collections import deque
-def findLink(node,closed):
-    node_key=tuple(node)
-    if node_key in closed:
-        return (node,closed[node_key])
-    return None
+from utils.stateKey import resolve_key, identity_key
+from utils.nodeStore import NodeStore
+from utils.pathWalk import PathWalk
+from utils.searchStats import reports_stats
 
 
-def reconstruct_path(nodePair,closed):
-    node,parent=nodePair
-    path=[]
-    path.append(node)
-    while parent is not None:
-        path.append(parent)
-        node,parent=findLink(parent,closed)
-    return path[::-1]
 
 
-
-
-def dfs_closed(start_state,movegen,goal_test):
-    open=deque([(start_state,None)])
-    open_set={tuple(start_state)}
-    closed={}
+@reports_stats(movegen="movegen",goal_test="goal_test")
+def dfs_closed(start_state,movegen,goal_test,key=None,decode=None,stats=None):
+    key=resolve_key(key)
+    store=NodeStore(key,decode)
+    ids=store.ids
+    add=store.add
+    own_key=key is identity_key  # e.g. packed boards: no key call per child
+    open=[(start_state,store.add(start_state,key(start_state)))]
     while open:
-        nodePair = open.pop()
-        node = nodePair[0]
-        open_set.remove(tuple(node))
-
-        closed[tuple(node)]=nodePair[1]
+        node,node_id = open.pop()
         if goal_test(node):
-            return reconstruct_path(nodePair,closed)
+            return store.path(node_id)
         else:
-            childs=movegen(node)
-            childs=[child for child in childs if tuple(child) not in open_set and tuple(child) not in closed]
-            open.extend([(child,node) for child in childs])
-            open_set.update(tuple(child) for child in childs)
-    return False
\ No newline at end of file
+            for child in movegen(node):
+                child_key=child if own_key else key(child)
+                if child_key not in ids:
+                    open.append((child,add(child,child_key,node_id)))
+                elif stats is not None:
+                    stats.duplicates_pruned+=1
+            if stats is not None:
+                stats.observe(len(open),len(store)-len(open))
+    return False
+
+
+def dfs_all(start_state,movegen,goal_test,key=None):
+    """Yield the path to every goal reachable from start_state, depth first.
+
+    Only the current path is kept (with one iterator over the children of each
+    state on it), so memory is O(b*depth) and the caller may stop at any point.
+    Children already on the path would close a cycle and are skipped; a goal
+    reached along several acyclic paths is yielded once per path. Every yielded
+    path is a new list.
+    """
+    key=resolve_key(key)
+    if goal_test(start_state):
+        yield [start_state]
+    path=[start_state]
+    keys=[key(start_state)]
+    on_path=set(keys)
+
+    def backtrack():
+        on_path.discard(keys.pop())
+        path.pop()
+
+    walk=PathWalk(movegen(start_state),backtrack)
+    for child in walk:
+        child_key=key(child)
+        if child_key in on_path:
+            continue
+        path.append(child)
+        keys.append(child_key)
+        on_path.add(child_key)
+        if goal_test(child):
+            yield path[:]
+        walk.descend(movegen(child))
@@ -0,0 +1,152 @@
+"""Reverse-BFS distance oracle for many queries towards one fixed goal.
+
+One breadth-first search backwards from the goal states (following
+predecessors) visits the whole space that can reach them, and records for
+every state, indexed by its rank:
+
+    dist[rank]  moves to the nearest goal (bytearray, UNREACHABLE if none)
+    next[rank]  rank of the state one move closer to the goal (array 'i')
+
+After that, path(state) follows next from the state's rank and returns an
+optimal path, start to goal like bfs_closed, in time proportional to its
+length. A codec is (rank, unrank, size): rank maps a state to 0..size-1 and
+unrank maps it back. permutation_codec and mixed_radix_codec cover the tile
+puzzles and small tuple states:
+
+    codec = permutation_codec(9)
+    oracle = DistanceOracle.build([[1,2,3,4,5,6,7,8,0]], movegen, codec)
+    oracle.save("oracle_8puzzle")
+    ...
+    oracle = DistanceOracle.load("oracle_8puzzle", codec)
+    path = oracle.path(start_node)
+
+predecessors(state) lists the states one move away from `state` towards it;
+movegen itself for reversible domains, classic_predecessors for the water jug.
+"""
+import os
+import json
+from array import array
+from collections import deque
+from math import factorial
+
+
+UNREACHABLE = 255
+META = "oracle.json"
+
+
+def permutation_codec(n):
+    """(rank, unrank, n!) for lists holding a permutation of 0..n-1 (Lehmer code)."""
+    def rank(state):
+        r = 0
+        for i, v in enumerate(state):
+            smaller = v
+            for u in state[:i]:
+                if u < v:
+                    smaller -= 1
+            r = r*(n-i)+smaller
+        return r
+
+    def unrank(r):
+        digits = []
+        for base in range(1, n+1):
+            r, digit = divmod(r, base)
+            digits.append(digit)
+        remaining = list(range(n))
+        return [remaining.pop(digit) for digit in reversed(digits)]
+    return rank, unrank, factorial(n)
+
+
+def mixed_radix_codec(radices):
+    """(rank, unrank, size) for lists of ints where item i is in 0..radices[i]-1,
+    e.g. (A_CAP+1, B_CAP+1) for water jug states [x, y]."""
+    size = 1
+    for radix in radices:
+        size *= radix
+
+    def rank(state):
+        r = 0
+        for v, radix in zip(state, radices):
+            r = r*radix+v
+        return r
+
+    def unrank(r):
+        state = []
+        for radix in reversed(radices):
+            r, v = divmod(r, radix)
+            state.append(v)
+        state.reverse()
+        return state
+    return rank, unrank, size
+
+
+class DistanceOracle:
+    def __init__(self, codec, dist, next_rank):
+        self.rank, self.unrank, self.size = codec
+        self.dist = dist
+        self.next = next_rank
+
+    @classmethod
+    def build(cls, goals, predecessors, codec):
+        """Backward BFS from every goal state at once."""
+        rank, unrank, size = codec
+        dist = bytearray([UNREACHABLE])*size
+        next_rank = array('i', [-1])*size
+        queue = deque()
+        for goal in goals:
+            r = rank(goal)
+            if dist[r] == UNREACHABLE:
+                dist[r] = 0
+                next_rank[r] = r
+                queue.append(r)
+        while queue:
+            r = queue.popleft()
+            d = dist[r]+1
+            if d >= UNREACHABLE:
+                raise ValueError(f"distances above {UNREACHABLE-1} do not fit the byte table")
+            for parent in predecessors(unrank(r)):
+                p = rank(parent)
+                if dist[p] == UNREACHABLE:
+                    dist[p] = d
+                    next_rank[p] = r
+                    queue.append(p)
+        return cls(codec, dist, next_rank)
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "dist.bin"), "wb") as f:
+            f.write(self.dist)
+        with open(os.path.join(directory, "next.bin"), "wb") as f:
+            self.next.tofile(f)
+        meta = {"size": self.size, "reachable": self.size-self.dist.count(UNREACHABLE)}
+        with open(os.path.join(directory, META), "w") as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, directory, codec):
+        with open(os.path.join(directory, META)) as f:
+            meta = json.load(f)
+        if meta["size"] != codec[2]:
+            raise ValueError(f"oracle in {directory} has {meta['size']} states, the codec {codec[2]}")
+        with open(os.path.join(directory, "dist.bin"), "rb") as f:
+            dist = bytearray(f.read())
+        next_rank = array('i')
+        with open(os.path.join(directory, "next.bin"), "rb") as f:
+            next_rank.fromfile(f, meta["size"])
+        return cls(codec, dist, next_rank)
+
+    def distance(self, state):
+        """Moves from state to the nearest goal, or None if no goal is reachable."""
+        d = self.dist[self.rank(state)]
+        return None if d == UNREACHABLE else d
+
+    def path(self, state):
+        """Optimal path from state to a goal, or False if there is none."""
+        r = self.rank(state)
+        if self.dist[r] == UNREACHABLE:
+            return False
+        path = [state]
+        next_rank = self.next
+        while self.dist[r]:
+            r = next_rank[r]
+            path.append(self.unrank(r))
+        return path
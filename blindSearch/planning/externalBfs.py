@@ -0,0 +1,226 @@
+"""External-memory breadth-first search with delayed duplicate detection.
+
+For state spaces that do not fit in RAM. Every state is written as a fixed-width
+record (encode/decode, e.g. int_codec(6) for packed 8-puzzle boards) and every
+BFS layer lives on disk as one sorted file of unique records:
+
+    workdir/layer_0000.bin, layer_0001.bin, ...
+    workdir/manifest.json    record size, start record, layer sizes, goal record
+
+Expanding layer d writes its children to sorted run files, at most
+buffer_records records are held in memory at a time. The runs are then merged,
+duplicates dropped, and every record already present in layer d or d-1 is
+removed by merging against those two files. For undirected (reversible) state
+spaces these are the only layers a child can repeat, so the result is exactly
+layer d+1. Layer files are read back with memory-mapped I/O.
+
+The manifest is rewritten after each completed layer, so a crashed run started
+again with the same workdir resumes from the last completed layer. A workdir
+whose manifest has another record size or start record is searched again from
+layer 0, its old layers are never reused for a different start. The path
+is rebuilt backwards from the goal by looking up, in each earlier layer, a
+neighbour of the current state with a binary search over the mapped file.
+"""
+import os
+import json
+import mmap
+import heapq
+
+from utils.searchStats import reports_stats
+from utils.atomicFile import atomic_write
+
+MANIFEST = "manifest.json"
+
+
+def int_codec(record_size):
+    """(encode, decode) for non-negative int states as big-endian records, so that
+    byte order matches numeric order."""
+    def encode(state):
+        return state.to_bytes(record_size, "big")
+
+    def decode(record):
+        return int.from_bytes(record, "big")
+    return encode, decode
+
+
+def layer_path(workdir, depth):
+    return os.path.join(workdir, f"layer_{depth:04d}.bin")
+
+
+def run_path(workdir, depth, index):
+    return os.path.join(workdir, f"run_{depth:04d}_{index:04d}.bin")
+
+
+class MappedRecords:
+    """Sorted fixed-width records of one file, memory-mapped read-only."""
+
+    def __init__(self, path, record_size):
+        self.record_size = record_size
+        self.file = open(path, "rb")
+        size = os.fstat(self.file.fileno()).st_size
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.count = size // record_size
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        start = i*self.record_size
+        return self.map[start:start+self.record_size]
+
+    def __iter__(self):
+        rs = self.record_size
+        m = self.map
+        for start in range(0, self.count*rs, rs):
+            yield m[start:start+rs]
+
+    def __contains__(self, record):
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo+hi)//2
+            if self[mid] < record:
+                lo = mid+1
+            else:
+                hi = mid
+        return lo < self.count and self[lo] == record
+
+    def close(self):
+        if self.count:
+            self.map.close()
+        self.file.close()
+
+
+def read_manifest(workdir):
+    path = os.path.join(workdir, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_manifest(workdir, manifest):
+    with atomic_write(os.path.join(workdir, MANIFEST), "w") as f:
+        json.dump(manifest, f)
+
+
+def write_runs(layer, movegen, encode, decode, workdir, depth, buffer_records):
+    """Expand every state of a layer into sorted, duplicate-free run files."""
+    paths = []
+    buffer = set()
+    for record in layer:
+        for child in movegen(decode(record)):
+            buffer.add(encode(child))
+        if len(buffer) >= buffer_records:
+            paths.append(flush_run(buffer, workdir, depth, len(paths)))
+            buffer = set()
+    if buffer:
+        paths.append(flush_run(buffer, workdir, depth, len(paths)))
+    return paths
+
+
+def flush_run(buffer, workdir, depth, index):
+    path = run_path(workdir, depth, index)
+    with open(path, "wb") as f:
+        f.write(b"".join(sorted(buffer)))
+    return path
+
+
+def merge_layer(run_paths, previous, out_path, goal_test, decode, record_size):
+    """Merge the runs into the next layer file, dropping duplicates and every record
+    of the `previous` layers. Returns (layer size, first goal record or None)."""
+    runs = [MappedRecords(p, record_size) for p in run_paths]
+    seen = heapq.merge(*previous)
+    seen_record = next(seen, None)
+    last = None
+    count = 0
+    goal = None
+    with atomic_write(out_path) as out:
+        for record in heapq.merge(*runs):
+            if record == last:
+                continue
+            last = record
+            while seen_record is not None and seen_record < record:
+                seen_record = next(seen, None)
+            if seen_record == record:
+                continue
+            out.write(record)
+            count += 1
+            if goal is None and goal_test(decode(record)):
+                goal = record
+    for run in runs:
+        run.close()
+    return count, goal
+
+
+def reconstruct_path(goal_record, goal_depth, movegen, encode, decode, workdir, record_size):
+    # walk back one layer at a time: in a reversible space a parent of the state
+    # at depth d is one of its neighbours stored in layer d-1
+    path = [decode(goal_record)]
+    for depth in range(goal_depth-1, -1, -1):
+        layer = MappedRecords(layer_path(workdir, depth), record_size)
+        for neighbour in movegen(path[-1]):
+            if encode(neighbour) in layer:
+                path.append(neighbour)
+                break
+        layer.close()
+    return path[::-1]
+
+
+@reports_stats(movegen="movegen", goal_test="goal_test")
+def external_bfs(start_state, movegen, goal_test, encode, decode, record_size, workdir, buffer_records=1000000, stats=None):
+    """BFS on disk for undirected state spaces, see the module docstring.
+
+    Returns the path from start_state to the first goal found (same format as
+    bfs_closed) or False when the space is exhausted. Layer sizes are printed as
+    layers complete. With stats, the frontier is the layer just built and closed
+    the states on disk before it; a resumed run counts only its own layers, and
+    the movegen calls that rebuild the path count as expansions too.
+    """
+    os.makedirs(workdir, exist_ok=True)
+    manifest = read_manifest(workdir)
+    start_record = encode(start_state)
+    if manifest is not None and (manifest["record_size"] != record_size or manifest.get("start") != start_record.hex()):
+        print("Workdir holds a search with another start or record size, starting over")
+        manifest = None
+    if manifest is None:
+        with open(layer_path(workdir, 0), "wb") as f:
+            f.write(start_record)
+        goal = start_record.hex() if goal_test(start_state) else None
+        manifest = {"record_size": record_size, "start": start_record.hex(), "layers": [1], "goal": goal}
+        write_manifest(workdir, manifest)
+        print("Layer 0: 1 states")
+    else:
+        print(f"Resuming after layer {len(manifest['layers'])-1}")
+
+    while manifest["goal"] is None and manifest["layers"][-1] > 0:
+        depth = len(manifest["layers"])-1
+        # runs left behind by a crash while expanding this layer are rebuilt
+        for name in os.listdir(workdir):
+            if name.startswith(f"run_{depth:04d}_"):
+                os.remove(os.path.join(workdir, name))
+        layer = MappedRecords(layer_path(workdir, depth), record_size)
+        generated = stats.nodes_generated if stats is not None else 0
+        run_paths = write_runs(layer, movegen, encode, decode, workdir, depth, buffer_records)
+
+        previous = [layer]
+        if depth > 0:
+            previous.append(MappedRecords(layer_path(workdir, depth-1), record_size))
+        size, goal = merge_layer(run_paths, previous, layer_path(workdir, depth+1), goal_test, decode, record_size)
+        for records in previous:
+            records.close()
+        for path in run_paths:
+            os.remove(path)
+
+        manifest["layers"].append(size)
+        if stats is not None:
+            stats.duplicates_pruned += stats.nodes_generated-generated-size
+            stats.observe(size, sum(manifest["layers"])-size)
+        if goal is not None:
+            manifest["goal"] = goal.hex()
+        write_manifest(workdir, manifest)
+        print(f"Layer {depth+1}: {size} states")
+
+    if manifest["goal"] is None:
+        return False
+    goal_depth = len(manifest["layers"])-1
+    return reconstruct_path(bytes.fromhex(manifest["goal"]), goal_depth, movegen, encode, decode, workdir, record_size)
@@ -0,0 +1,202 @@
+"""Level-synchronous parallel breadth-first search.
+
+The closed set is split into shards, one per worker process, by a hash of the
+state key (shard(key) % workers). Each worker owns its shard and the part of
+the current frontier that falls in it. At every BFS level each worker
+
+    expands its frontier and sorts the children into one bucket per owning
+    shard, puts every other shard's bucket straight into that worker's inbox
+    (a multiprocessing.Queue, pickled by its feeder thread while the worker
+    goes on) and keeps its own bucket unpickled;
+    takes the other workers' buckets from its own inbox, drops children
+    already in its shard, records the parent key of the new ones, goal-tests
+    them and keeps them as its next frontier.
+
+The master only starts each level and adds up a few counts per worker, so
+successors never pass through it and the expansion, exchange, duplicate
+detection and goal tests all run in the workers. Workers are long-lived
+processes rather than a Pool because every shard has to stay in the same
+process for the whole search. If a worker dies the others are terminated and
+a RuntimeError is raised.
+
+benchmarks/parallelBfsSweep.py times a full 8-puzzle sweep against bfs_closed
+for 1, 2, 4, ... workers; a speedup needs more cores than workers and a
+movegen that costs more than pickling its children.
+
+movegen, goal_test, key and shard are handed to the workers when they start.
+With the default fork start method on Linux anything works; with spawn they
+must be picklable module-level functions, and keys must hash the same in every
+process (ints and tuples of ints do, str keys need PYTHONHASHSEED).
+"""
+import multiprocessing as mp
+from multiprocessing.connection import wait
+from time import perf_counter
+
+from utils.stateKey import resolve_key
+from utils.searchStats import reports_stats
+
+
+def default_shard(state_key):
+    return hash(state_key)
+
+
+def worker(conn, index, inboxes, movegen, goal_test, key, shard, decode):
+    workers = len(inboxes)
+    inbox = inboxes[index]
+    closed = {}      # state key -> (state or None, parent key)
+    frontier = []    # (state, key) pairs of the current level owned by this shard
+    while True:
+        message = conn.recv()
+        command = message[0]
+        if command == "start":
+            _, state = message
+            state_key = key(state)
+            closed[state_key] = (None if decode else state, None)
+            frontier = [(state, state_key)]
+        elif command == "level":
+            # expanded, generated, duplicates pruned, movegen and goal_test time
+            counts = [len(frontier), 0, 0, 0.0, 0.0]
+            buckets = [[] for _ in range(workers)]
+            emitted = set()
+            for node, node_key in frontier:
+                start = perf_counter()
+                children = movegen(node)
+                counts[3] += perf_counter()-start
+                for child in children:
+                    counts[1] += 1
+                    child_key = key(child)
+                    if child_key in emitted:
+                        counts[2] += 1
+                        continue
+                    emitted.add(child_key)
+                    buckets[shard(child_key) % workers].append((child, child_key, node_key))
+            for j, bucket in enumerate(buckets):
+                if j != index:
+                    inboxes[j].put(bucket)
+            received = [buckets[index]]
+            for _ in range(workers-1):
+                received.append(inbox.get())
+            frontier = []
+            goal = None
+            for bucket in received:
+                for child, child_key, parent_key in bucket:
+                    if child_key not in closed:
+                        closed[child_key] = (None if decode else child, parent_key)
+                        frontier.append((child, child_key))
+                        if goal is None:
+                            start = perf_counter()
+                            if goal_test(child):
+                                goal = child_key
+                            counts[4] += perf_counter()-start
+                    else:
+                        counts[2] += 1
+            conn.send((len(frontier), len(closed), goal, counts))
+        elif command == "link":
+            _, state_key = message
+            conn.send(closed[state_key])
+        elif command == "stop":
+            conn.close()
+            return
+
+
+def replies(pipes, processes):
+    """One reply from every worker, in worker order. A worker that exits
+    first raises EOFError: the others may be waiting for its buckets."""
+    pending = {conn: i for i, conn in enumerate(pipes)}
+    sentinels = [process.sentinel for process in processes]
+    results = [None]*len(pipes)
+    while pending:
+        ready = wait(list(pending)+sentinels)
+        answered = [conn for conn in ready if conn in pending]
+        for conn in answered:
+            results[pending.pop(conn)] = conn.recv()
+        if not answered:
+            raise EOFError("a worker exited")
+    return results
+
+
+@reports_stats()
+def parallel_bfs(start_state, movegen, goal_test, key=None, decode=None, workers=None, shard=default_shard, verbose=True, stats=None):
+    """Parallel BFS over `workers` processes (default: one per CPU).
+
+    Returns the path from start_state to a shallowest goal, in the same format
+    as bfs_closed, or False when the space is exhausted. With decode (the
+    inverse of key) shards keep only keys and the path is decoded from them.
+
+    The callbacks run in the workers, so stats are counted there and summed
+    once per level; time["movegen"] and time["goal_test"] are CPU time added
+    up over all workers.
+    """
+    key = resolve_key(key)
+    if workers is None:
+        workers = mp.cpu_count()
+    if goal_test(start_state):
+        return [start_state]
+
+    inboxes = [mp.Queue() for _ in range(workers)]
+    pipes = []
+    processes = []
+    for index in range(workers):
+        parent_conn, child_conn = mp.Pipe()
+        process = mp.Process(target=worker, args=(child_conn, index, inboxes, movegen, goal_test, key, shard, decode), daemon=True)
+        process.start()
+        child_conn.close()
+        pipes.append(parent_conn)
+        processes.append(process)
+
+    def owner(state_key):
+        return pipes[shard(state_key) % workers]
+
+    failed = False
+    try:
+        start_key = key(start_state)
+        owner(start_key).send(("start", start_state))
+        depth = 0
+        goal_key = None
+        frontier_size = 1
+        while frontier_size and goal_key is None:
+            for conn in pipes:
+                conn.send(("level",))
+            frontier_size = 0
+            closed_size = 0
+            for size, shard_closed, goal, counts in replies(pipes, processes):
+                frontier_size += size
+                closed_size += shard_closed
+                if goal is not None and goal_key is None:
+                    goal_key = goal
+                if stats is not None:
+                    stats.nodes_expanded += counts[0]
+                    stats.nodes_generated += counts[1]
+                    stats.duplicates_pruned += counts[2]
+                    stats.time["movegen"] += counts[3]
+                    stats.time["goal_test"] += counts[4]
+            if stats is not None:
+                stats.observe(frontier_size, closed_size-frontier_size)
+            depth += 1
+            if verbose:
+                print(f"Exploring depth: {depth}, frontier: {frontier_size}, closed: {closed_size}")
+
+        if goal_key is None:
+            return False
+        path = []
+        node_key = goal_key
+        while node_key is not None:
+            conn = owner(node_key)
+            conn.send(("link", node_key))
+            node, parent_key = conn.recv()
+            path.append(decode(node_key) if decode else node)
+            node_key = parent_key
+        return path[::-1]
+    except (EOFError, BrokenPipeError, ConnectionResetError) as error:
+        failed = True
+        exit_codes = [process.exitcode for process in processes]
+        raise RuntimeError(f"a parallel_bfs worker died (exit codes {exit_codes})") from error
+    finally:
+        if failed:
+            for process in processes:
+                process.terminate()
+        else:
+            for conn in pipes:
+                conn.send(("stop",))
+        for process in processes:
+            process.join()
@@ -5,7 +5,27 @@ g(n) = actual cost from start to n
 h(n) = heuristic estimate from n to goal
 """
 
-def a_star(start, goal_test, move_gen, h):
+import sys
+import os
+# Add parent directory to Python path so we can import from utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import heapq
+from array import array
+from itertools import count
+from time import perf_counter
+
+from utils.stateKey import resolve_key
+from utils.nodeStore import NodeStore
+from utils.searchStats import reports_stats
+
+
+def unit_cost(n, m):
+    return 1
+
+
+@reports_stats(movegen="move_gen", goal_test="goal_test", heuristic="h")
+def a_star(start, goal_test, move_gen, h, cost=unit_cost, key=None, decode=None, consistent=False, stats=None):
     """
     A* Algorithm
     
@@ -14,140 +34,217 @@ def a_star(start, goal_test, move_gen, h):
     - goal_test: function to check if a state is a goal
     - move_gen: function to generate children (neighbors) of a state
     - h: heuristic function h(N) that estimates cost from N to goal
+    - cost: edge cost function k(N, M) (default: 1 for every move)
+    - key: optional key(state) giving a hashable canonical key; computed once
+      per generated node and interned in a NodeStore whose integer ids index
+      the parent, g and f columns (default: utils.stateKey.state_key, so
+      list states work)
+    - decode: optional inverse of key, lets the store keep only the keys
+    - consistent: set when h is consistent (h(N) <= k(N, M) + h(M)); a node
+      is then never expanded twice, so improvements to CLOSED nodes are skipped
+    - stats: optional True or SearchStats; the result is then returned as
+      (path, stats), see utils/searchStats.py
     
     Returns:
     - path to goal or None if no solution
+
+    OPEN is a binary heap of (f, tie, id) entries. A node whose f decreases is
+    pushed again instead of being moved inside the heap; the outdated entry is
+    dropped when it is popped (lazy deletion). Reopening a CLOSED node puts it
+    back in OPEN, so its descendants are improved when it is expanded again,
+    which takes the place of PROPAGATEIMPROVEMENT. All tables are local to the
+    call, so searches can run concurrently.
     """
-    # parent(S) ← null
-    parent = {start: None}
-    
-    # g(S) ← 0
-    g = {start: 0}
+    key = resolve_key(key)
+    tie = count()
+
+    # parent(S) ← null; g(S) ← 0
+    store = NodeStore(key, decode, costs=True)
+    S = store.add(start, key(start))
+    g = store.g
     
     # f(S) ← g(S) + h(S)
-    f = {start: g[start] + h(start)}
+    f = array('d', [g[S] + h(start)])
     
     # OPEN ← {S}
-    OPEN = [start]
+    OPEN = [(f[S], next(tie), S)]
     
     # CLOSED ← empty list
-    CLOSED = []
+    CLOSED = set()
     
     # while OPEN is not empty
     while OPEN:
         # N ← remove node with lowest f-value from OPEN
-        N = min(OPEN, key=lambda node: f.get(node, float('inf')))
-        OPEN.remove(N)
+        N_f, _, N_id = heapq.heappop(OPEN)
+        # outdated entry: N was pushed again with a lower f, or already expanded
+        if N_id in CLOSED or N_f > f[N_id]:
+            continue
+        N = store.state(N_id)
         
         # add N to CLOSED
-        CLOSED.append(N)
+        CLOSED.add(N_id)
         
         # if GOALTEST(N) == TRUE then return RECONSTRUCTPATH(N)
         if goal_test(N):
-            return reconstruct_path(N, parent)
+            return store.path(N_id)
         
         # for each neighbour M ∈ MOVEGEN(N)
         for M in move_gen(N):
+            M_key = key(M)
+            M_id = store.get(M_key)
+            g_M = g[N_id] + cost(N, M)
             # if (M ∉ OPEN and M ∉ CLOSED)
-            if M not in OPEN and M not in CLOSED:
+            if M_id is None:
                 # parent(M) ← N
-                parent[M] = N
-                
                 # g(M) ← g(N) + k(N, M); f(M) ← g(M) + h(M)
-                g[M] = g[N] + k(N, M)
-                f[M] = g[M] + h(M)
+                M_id = store.add(M, M_key, N_id, g_M)
+                f.append(g_M + h(M))
                 
                 # add M to OPEN
-                OPEN.append(M)
+                heapq.heappush(OPEN, (f[M_id], next(tie), M_id))
             
             # else
             else:
+                if stats is not None:
+                    stats.duplicates_pruned += 1
+                # with a consistent h, g(M) is already optimal once M is CLOSED
+                if consistent and M_id in CLOSED:
+                    continue
                 # if (g(N) + k(N, M)) < g(M)
-                if (g[N] + k(N, M)) < g.get(M, float('inf')):
+                if g_M < g[M_id]:
                     # parent(M) ← N
-                    parent[M] = N
-                    
                     # g(M) ← g(N) + k(N, M); f(M) ← g(M) + h(M)
-                    g[M] = g[N] + k(N, M)
-                    f[M] = g[M] + h(M)
+                    f[M_id] = f[M_id] - g[M_id] + g_M
+                    store.relink(M_id, N_id, g_M)
                     
-                    # if X ∈ CLOSED
-                    if M in CLOSED:
-                        # PROPAGATEIMPROVEMENT(M)
-                        propagate_improvement(M, parent, g, f, h, CLOSED)
+                    # if M ∈ CLOSED, reopen it
+                    CLOSED.discard(M_id)
+                    heapq.heappush(OPEN, (f[M_id], next(tie), M_id))
+
+        if stats is not None:
+            stats.observe(len(OPEN), len(CLOSED))
     
     # return empty list
     return None
 
 
-def propagate_improvement(M, parent, g, f, h, CLOSED):
-    """
-    PROPAGATEIMPROVEMENT(M)
-    Update costs of descendants when a better path is found
-    
-    Parameters:
-    - M: node whose cost was improved
-    - parent: parent dictionary
-    - g: g-values dictionary
-    - f: f-values dictionary
-    - h: heuristic function
-    - CLOSED: closed list
-    """
-    # for each neighbour X ∈ MOVEGEN(M)
-    for X in move_gen(M):
-        # if g(M) + k(M, X) < g(X)
-        if g[M] + k(M, X) < g.get(X, float('inf')):
-            # parent(X) ← M
-            parent[X] = M
-            
-            # g(X) ← g(M) + k(M, X)
-            g[X] = g[M] + k(M, X)
-            
-            # f(X) ← g(X) + h(X)
-            f[X] = g[X] + h(X)
-            
-            # if X ∈ CLOSED
-            if X in CLOSED:
-                # PROPAGATEIMPROVEMENT(X)
-                propagate_improvement(X, parent, g, f, h, CLOSED)
-
 
-def reconstruct_path(node, parent):
+@reports_stats(movegen="move_gen", goal_test="goal_test", heuristic="h")
+def ara_star(start, goal_test, move_gen, h, cost=unit_cost, key=None, decode=None, weight=3.0, weight_step=0.5,
+             on_solution=None, time_limit=None, node_limit=None, stats=None):
     """
-    Reconstruct path from start to node using parent pointers
+    Anytime Repairing A* (ARA*)
     
-    Parameters:
-    - node: goal node
-    - parent: parent dictionary
+    Runs weighted A* with f(N) = g(N) + w*h(N), starting from w = weight, to get
+    a first solution quickly. It then lowers w by weight_step down to 1 and
+    searches again, reusing g values and parents from the earlier passes.
+    Only nodes whose g improved since they were expanded (INCONS) go back in
+    OPEN.
+    
+    Parameters (as in a_star, plus):
+    - weight, weight_step: initial heuristic weight and its decrease per pass
+    - on_solution: optional on_solution(path, cost, bound), called whenever a
+      cheaper solution is found; its cost is at most bound times the optimum
+    - time_limit: optional wall-clock budget in seconds
+    - node_limit: optional budget of node expansions
     
     Returns:
-    - path from start to node
-    """
-    path = []
-    current = node
-    while current is not None:
-        path.append(current)
-        current = parent.get(current)
-    return list(reversed(path))
-
-
-# Global edge costs (for k function)
-edge_costs = {}
-
-
-def k(n, m):
+    - the best path found when w reaches 1 (optimal for an admissible h) or a
+      budget runs out, or None if no solution was found
     """
-    Cost function between nodes n and m
-    """
-    return edge_costs.get((n, m), 1)
+    key = resolve_key(key)
+    deadline = perf_counter() + time_limit if time_limit is not None else None
+    tie = count()
+    w = weight
 
+    store = NodeStore(key, decode, costs=True)
+    S = store.add(start, key(start))
+    g = store.g
+    H = array('d', [h(start)])  # h of every node, computed once
+    
+    GOALS = set()
+    best = None  # id of the cheapest goal found so far
+    if goal_test(start):
+        GOALS.add(S)
+        best = S
+    
+    OPEN = {S}
+    heap = [(g[S] + w*H[S], next(tie), S)]
+    CLOSED = set()
+    INCONS = set()  # nodes improved after being expanded in this pass
+    expanded = 0
+    solution = None
+    published = None
+    
+    while True:
+        # IMPROVEPATH: weighted A* until no node in OPEN can beat the best goal
+        exhausted = False
+        while True:
+            # drop entries of nodes no longer in OPEN or pushed again with a lower f
+            while heap and (heap[0][2] not in OPEN or heap[0][0] != g[heap[0][2]] + w*H[heap[0][2]]):
+                heapq.heappop(heap)
+            if not heap or (best is not None and g[best] <= heap[0][0]):
+                break
+            if (node_limit is not None and expanded >= node_limit) or (deadline is not None and perf_counter() >= deadline):
+                exhausted = True
+                break
+            _, _, N_id = heapq.heappop(heap)
+            OPEN.discard(N_id)
+            CLOSED.add(N_id)
+            expanded += 1
+            N = store.state(N_id)
+            
+            for M in move_gen(N):
+                M_key = key(M)
+                M_id = store.get(M_key)
+                g_M = g[N_id] + cost(N, M)
+                if M_id is None:
+                    M_id = store.add(M, M_key, N_id, g_M)
+                    H.append(h(M))
+                    if goal_test(M):
+                        GOALS.add(M_id)
+                elif g_M < g[M_id]:
+                    store.relink(M_id, N_id, g_M)
+                else:
+                    if stats is not None:
+                        stats.duplicates_pruned += 1
+                    continue
+                
+                if M_id in GOALS and (best is None or g_M < g[best]):
+                    best = M_id
+                if M_id in CLOSED:
+                    INCONS.add(M_id)
+                else:
+                    OPEN.add(M_id)
+                    heapq.heappush(heap, (g_M + w*H[M_id], next(tie), M_id))
 
-# Global move_gen function for propagate_improvement
-def move_gen(node):
-    """
-    This will be set in main
-    """
-    return []
+            if stats is not None:
+                stats.observe(len(OPEN), len(CLOSED))
+        
+        if best is not None and (published is None or g[best] < published):
+            published = g[best]
+            solution = store.path(best)
+            # every cheaper solution passes through OPEN or INCONS, so the
+            # optimum is at least the lowest g + h found there
+            lower = min((g[i] + H[i] for i in OPEN | INCONS), default=published)
+            bound = published/lower if lower > 0 else 1.0
+            if not exhausted:
+                bound = min(bound, w)
+            if stats is not None:
+                stats.iterations.append({"weight": w, "cost": published, "bound": bound, "nodes_expanded": expanded})
+            if on_solution is not None:
+                on_solution(solution, published, bound)
+        
+        if exhausted or w <= 1 or not (OPEN or INCONS):
+            return solution
+        
+        # next pass: lower w, move INCONS into OPEN and rebuild the heap
+        w = max(1.0, w - weight_step)
+        OPEN |= INCONS
+        INCONS = set()
+        CLOSED = set()
+        heap = [(g[i] + w*H[i], next(tie), i) for i in OPEN]
+        heapq.heapify(heap)
 
 
 # Example usage
@@ -164,6 +261,7 @@ if __name__ == "__main__":
     }
     
     # Build edge costs
+    edge_costs = {}
     for node, edges in graph.items():
         for neighbor, cost in edges:
             edge_costs[(node, neighbor)] = cost
@@ -179,11 +277,11 @@ if __name__ == "__main__":
         'G': 0
     }
     
-    def move_gen_impl(node):
+    def move_gen(node):
         return [neighbor for neighbor, _ in graph.get(node, [])]
     
-    # Set global move_gen
-    move_gen = move_gen_impl
+    def k(n, m):
+        return edge_costs[(n, m)]
     
     def goal_test(node):
         return node == 'G'
@@ -191,7 +289,7 @@ if __name__ == "__main__":
     def h(node):
         return heuristic.get(node, 0)
     
-    result = a_star('S', goal_test, move_gen_impl, h)
+    result = a_star('S', goal_test, move_gen, h, k)
     print("Path found:", result)
     
     if result:
@@ -1,94 +1,127 @@
-"""AO* algorithm closely matching the lecture slide pseudocode."""
+"""AO* algorithm closely matching the lecture slide pseudocode.
 
-def ao_star(start, futility, successors, h):
-    # add start to G
-    G = {start}
+successors(N) lists the arcs out of N. An arc is either a single child (an OR
+choice) or a tuple of children that must all be solved (an AND hyperedge); a
+node that is itself a tuple is given as a one-element tuple. A node with no
+successors is primitive and solved, at cost h(N). The cost of an arc from N is
+the sum of cost(N, C) + h(C) over its children C.
 
-    # compute h(start)
+Every node is expanded once: its arcs are cached and every child records N in
+a reverse-edge (parent) index, so revising a node only looks at its own arcs
+and only pushes its actual parents. Revision runs deepest node first off a
+heap.
+"""
+import sys
+import os
+# Add parent directory to Python path so we can import from utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import heapq
+from itertools import count
+
+from utils.pathWalk import PathWalk
+
+
+def zero_cost(node, child):
+    return 0
+
+
+def ao_star(start, futility, successors, h, cost=zero_cost):
+    """Returns the marked solution graph as {node: [children of its marked arc]},
+    or None when h(start) reaches futility."""
+    # memoized SUCCESSORS: node -> list of arcs, each a tuple of children
+    arcs = {}
+
+    def arcs_of(node):
+        if node not in arcs:
+            arcs[node] = [arc if isinstance(arc, tuple) else (arc,) for arc in successors(node)]
+        return arcs[node]
+
+    # add start to G; compute h(start)
     h_val = {start: h(start)}
+    depth = {start: 0}
+    parents = {start: set()}
 
-    # solved(start) ← FALSE
-    solved = {start: False}
+    # solved(start) ← FALSE, unless start is primitive
+    solved = {start: not arcs_of(start)}
 
-    # initially nothing is marked; we store a single best child list per node
+    # marked arc of every expanded node
     marked = {}
+    expanded = set()
+    tie = count()
 
     # while solved(start) = FALSE and h(start) < Futility
     while (not solved[start]) and (h_val[start] < futility):
 
         # label: FORWARD PHASE
-        # U ← trace marked paths in G to a set of unexpanded nodes
-        U = trace_unexpanded(start, G, marked, successors)
-
-        # N ← select a node from U  (just take one)
-        N = next(iter(U))
-
-        # children ← SUCCESSORS(N)
-        children = successors(N)
-
-        # if children is empty
-        if not children:
-            # h(N) ← Futility
+        # N ← an unexpanded node found by tracing marked paths in G
+        N, path = trace_unexpanded(start, marked, solved, expanded)
+        if N is None:
+            # every marked path ends in a solved node or a loop
+            break
+        expanded.add(N)
+
+        # children ← SUCCESSORS(N), without arcs that loop back onto the path
+        options = [arc for arc in arcs_of(N) if not any(c in path for c in arc)]
+        arcs[N] = options
+
+        # if children is empty: h(N) ← Futility
+        if not options:
             h_val[N] = futility
-        else:
-            # check for looping in the members of children
-            # remove any looping members from children
-            children = [c for c in children if c not in current_path_from_start(start, N, marked)]
-
-            # for each S ∈ children
-            for S in children:
-                # add S to G
-                if S not in G:
-                    G.add(S)
-
-                # compute h(S)
-                if S not in h_val:
-                    h_val[S] = h(S)
-
-                # if S is primitive
-                if len(successors(S)) == 0:
-                    # solved(S) ← TRUE
-                    solved[S] = True
+
+        # for each S ∈ children
+        for arc in options:
+            for S in arc:
+                # the reverse edge S → N
+                if S in parents:
+                    parents[S].add(N)
+                    continue
+                # add S to G; compute h(S)
+                parents[S] = {N}
+                h_val[S] = h(S)
+                depth[S] = depth[N] + 1
+                # if S is primitive: solved(S) ← TRUE
+                solved[S] = not arcs_of(S)
 
         # label: PROPAGATE BACK
-        # M ← {N}    /* set of modified nodes */
-        M = {N}
+        # M ← {N}    /* set of modified nodes */, deepest first
+        M = [(-depth[N], next(tie), N)]
+        in_M = {N}
 
         # while M is not empty
         while M:
-            # D ← remove deepest node from M (we just pop any)
-            D = M.pop()
-
-            # compute best cost of D from its children (OR node: min; no AND arcs here)
-            ch = successors(D)
-            if not ch:
-                best_cost = h_val[D]
-                best_children = []
-            else:
-                best_cost = float("inf")
-                best_children = []
-                for c in ch:
-                    if h_val[c] < best_cost:
-                        best_cost = h_val[c]
-                        best_children = [c]
+            # D ← remove deepest node from M
+            _, _, D = heapq.heappop(M)
+            in_M.discard(D)
 
             old_h = h_val[D]
-            h_val[D] = best_cost
-
-            # mark best option at D as MARKED
-            marked[D] = best_children
-
-            # if all nodes connected through marked arcs are solved
-            if all(solved.get(c, False) for c in best_children):
-                # solved(D) ← TRUE
-                solved[D] = True
-
-            # if D has changed
-            if h_val[D] != old_h:
-                # add all parents of D to M
-                for p in G:
-                    if D in successors(p):
-                        M.add(p)
+            old_solved = solved[D]
+            if D in expanded and arcs[D]:
+                # best arc of D: lowest sum of cost + h over its children
+                best_cost = float("inf")
+                best_arc = ()
+                for arc in arcs[D]:
+                    arc_cost = sum(cost(D, c) + h_val[c] for c in arc)
+                    if arc_cost < best_cost:
+                        best_cost = arc_cost
+                        best_arc = arc
+                h_val[D] = min(best_cost, futility)
+
+                # mark best option at D as MARKED
+                marked[D] = best_arc
+
+                # if all nodes connected through marked arcs are solved
+                solved[D] = all(solved[c] for c in best_arc)
+
+            # if D has changed (N itself always has): add parents of D to M.
+            # A higher h(D) or a newly solved D only matter to parents whose
+            # marked arc uses D, a lower h(D) may change the best arc anywhere
+            if D == N or h_val[D] != old_h or solved[D] != old_solved:
+                every_parent = h_val[D] < old_h
+                for p in parents[D]:
+                    if p not in in_M and (every_parent or D in marked.get(p, ())):
+                        in_M.add(p)
+                        heapq.heappush(M, (-depth[p], next(tie), p))
 
     # if solved(start) = TRUE return the marked subgraph; else null
     if solved[start]:
@@ -96,52 +129,42 @@ def ao_star(start, futility, successors, h):
     return None
 
 
-def trace_unexpanded(start, G, marked, successors):
-    """Trace marked paths from start to collect unexpanded nodes U."""
-    U = set()
+def trace_unexpanded(start, marked, solved, expanded):
+    """Follow marked arcs from start to the first unsolved, unexpanded node.
 
-    def visit(n):
-        # if n has no marked children yet, it is unexpanded
-        if n not in marked or not marked[n]:
-            U.add(n)
-            return
-        for c in marked[n]:
-            visit(c)
+    Returns (node, set of nodes on the path to it), or (None, None)."""
+    path = [start]
+    on_path = {start}
+    visited = {start}
+    if not solved[start] and start not in expanded:
+        return start, on_path
 
-    visit(start)
-    return U
+    def backtrack():
+        on_path.discard(path.pop())
 
-
-def current_path_from_start(start, target, marked):
-    """Return nodes on some marked path from start to target (for simple loop check)."""
-    path = []
-
-    def dfs(n):
-        path.append(n)
-        if n == target:
-            return True
-        for c in marked.get(n, []):
-            if dfs(c):
-                return True
-        path.pop()
-        return False
-
-    dfs(start)
-    return set(path)
+    walk = PathWalk(marked.get(start, ()), backtrack)
+    for child in walk:
+        if child in visited or solved[child]:
+            continue
+        visited.add(child)
+        path.append(child)
+        on_path.add(child)
+        if child not in expanded:
+            return child, on_path
+        walk.descend(marked.get(child, ()))
+    return None, None
 
 
 def extract_marked_subgraph(start, marked):
     """Collect nodes reachable from start following marked arcs."""
-    result = set()
-
-    def visit(n):
+    result = {}
+    stack = [start]
+    while stack:
+        n = stack.pop()
         if n in result:
-            return
-        result.add(n)
-        for c in marked.get(n, []):
-            visit(c)
-
-    visit(start)
+            continue
+        result[n] = list(marked.get(n, ()))
+        stack.extend(result[n])
     return result
 
 
@@ -155,7 +178,7 @@ if __name__ == "__main__":
     graph = {
         'GetToWork': ['TakeBus', 'DriveCar'],
         'TakeBus': [],  # Primitive - can do directly
-        'DriveCar': ['HaveCar', 'HaveGas'],  # AND node
+        'DriveCar': [('HaveCar', 'HaveGas')],  # AND arc
         'HaveCar': [],  # Primitive
         'HaveGas': []   # Primitive
     }
@@ -181,10 +204,10 @@ if __name__ == "__main__":
     
     if result:
         print("Solution found!")
-        print("Nodes in solution:", result)
+        print("Nodes in solution:", set(result))
         print("\nMarked paths:")
-        for node, children in marked.items():
-            if node in result:
+        for node, children in result.items():
+            if children:
                 print(f"  {node} -> {children}")
     else:
         print("No solution found (futile)")
@@ -4,7 +4,17 @@ Algorithm B&B searches in the space of partial paths.
 It extends the cheapest partial path till it finds one to the goal.
 """
 
-def b_and_b(start, goal_test, move_gen, k):
+import sys
+import os
+# Add parent directory to Python path so we can import from utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import heapq
+
+from utils.stateKey import resolve_key
+
+
+def b_and_b(start, goal_test, move_gen, k, key=None):
     """
     Branch and Bound algorithm
     
@@ -13,74 +23,93 @@ def b_and_b(start, goal_test, move_gen, k):
     - goal_test: function to check if a state is a goal
     - move_gen: function to generate children of a state
     - k: heuristic function k(N, M) that estimates cost from N to M
+    - key: optional key(state) giving a hashable canonical key (default:
+      utils.stateKey.state_key)
     
     Returns:
     - path to goal (reversed) or empty list if no solution
+
+    A partial path is a node (state, cost, parent node, state key), so paths
+    that share a prefix share its nodes and extending a path is O(1). OPEN is a heap of
+    (cost, -batch, index, path) entries: equal costs come out newest expansion
+    first and in children order, as with the stable sort of newPaths ++ OPEN.
+    A dominance table holds the cheapest cost known for every state; a
+    partial path reaching a state at higher cost is dropped, it cannot lead
+    to a cheaper solution.
     """
+    key = resolve_key(key)
     # OPEN ← ([S], 0) : [ ]
     # OPEN is a priority queue of (path, cost) pairs
-    OPEN = [([start], 0)]
+    start_key = key(start)
+    OPEN = [(0, 0, 0, (start, 0, None, start_key))]
+    best = {start_key: 0}
+    batch = 0
     
     while OPEN:
         # pathPair ← head OPEN
         # (path, cost) ← pathPair
-        path_pair = OPEN.pop(0)  # Remove head
-        path, cost = path_pair
+        cost, _, _, path = heapq.heappop(OPEN)  # Remove head
         
         # N ← head path
         N = path[0]  # Current node is head of path
         
+        # a cheaper path to N was found after this one was queued
+        if cost > best[path[3]]:
+            continue
+        
         # if GOALTEST(N) == true
         if goal_test(N):
             # then return reverse(path)
-            return list(reversed(path))
+            return reverse_path(path)
         
         # else
         # children ← MOVEGEN(N)
         children = move_gen(N)
         
         # newPaths ← MAKEPATHS(children, pathPair)
-        new_paths = make_paths(children, path_pair, k)
+        new_paths = make_paths(children, path, k, key)
         
         # OPEN ← SORT_cost(newPaths ++ tail OPEN)
-        OPEN = sorted(new_paths + OPEN, key=lambda x: x[1])
+        batch += 1
+        for index, new_path in enumerate(new_paths):
+            _, new_cost, _, M_key = new_path
+            if M_key in best and new_cost > best[M_key]:
+                continue
+            best[M_key] = new_cost
+            heapq.heappush(OPEN, (new_cost, -batch, index, new_path))
     
     # return empty list
     return []
 
 
-def make_paths(children, path_pair, k):
+def make_paths(children, path, k, key):
     """
     MAKEPATHS(children, pathPair)
     
     Parameters:
     - children: list of child nodes
-    - path_pair: (path, cost) tuple
+    - path: (state, cost, parent, key) path node
     - k: heuristic function
+    - key: state key function
     
     Returns:
-    - list of new (path, cost) pairs
+    - list of new path nodes, one per child
     """
-    # if children is empty
-    if not children:
-        # then return empty list
-        return []
-    
-    # else
-    # (path, cost) ← pathPair
-    path, cost = path_pair
-    
-    # M ← head children
-    M = children[0]
-    
     # N ← head path
-    N = path[0]
+    N, cost, _, _ = path
     
-    # return ([M,path], cost + k(N, M)): MAKEPATHS(tail children, pathPair)
-    new_path = [M] + path
-    new_cost = cost + k(N, M)
-    
-    return [(new_path, new_cost)] + make_paths(children[1:], path_pair, k)
+    # return ([M,path], cost + k(N, M)) for every M in children
+    return [(M, cost + k(N, M), path, key(M)) for M in children]
+
+
+def reverse_path(path):
+    """States from the start to the head of a path node (of either B&B)."""
+    states = []
+    while path is not None:
+        states.append(path[0])
+        path = path[2]
+    states.reverse()
+    return states
 
 
 # Example usage
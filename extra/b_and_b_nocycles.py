@@ -4,7 +4,18 @@ A version of B&B that avoids getting into loops.
 If a child of N is already present in the path, then that is discarded.
 """
 
-def b_and_b_nocycles(start, goal_test, move_gen, k):
+import sys
+import os
+# Add parent directory to Python path so we can import from utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import heapq
+
+from utils.stateKey import resolve_key
+from extra.b_and_b import reverse_path
+
+
+def b_and_b_nocycles(start, goal_test, move_gen, k, key=None):
     """
     Branch and Bound algorithm with cycle detection
     
@@ -13,127 +24,134 @@ def b_and_b_nocycles(start, goal_test, move_gen, k):
     - goal_test: function to check if a state is a goal
     - move_gen: function to generate children of a state
     - k: heuristic function k(N, M) that estimates cost from N to M
+    - key: optional key(state) giving a hashable canonical key (default:
+      utils.stateKey.state_key)
     
     Returns:
     - path to goal (reversed) or empty list if no solution
+
+    A partial path is a node (state, cost, parent node, chain, state key),
+    shared by all the paths extending it. chain is a 64-bit hash chain: the
+    parent's chain with the bit of hash(key(state)) set, so a state whose bit
+    is clear cannot be on the path. Possible hits walk the parent links
+    comparing the stored keys, so key is called once per generated state and
+    never during the walk (past about 64 states every bit is set and each
+    check walks). OPEN is a heap of (cost, -batch, index, path) entries, which
+    gives the same order as the stable sort of newPaths ++ OPEN. A dominance
+    table holds the cheapest cost known for every state; a partial path
+    reaching a state at higher cost is dropped.
     """
+    key = resolve_key(key)
     # OPEN ← ([S], 0) : [ ]
-    OPEN = [([start], 0)]
+    start_key = key(start)
+    OPEN = [(0, 0, 0, (start, 0, None, chain_bit(start_key), start_key))]
+    best = {start_key: 0}
+    batch = 0
     
     while OPEN:
         # pathPair ← head OPEN
-        path_pair = OPEN.pop(0)
         # (path, cost) ← pathPair
-        path, cost = path_pair
+        cost, _, _, path = heapq.heappop(OPEN)
         
         # N ← head path
         N = path[0]
         
+        # a cheaper path to N was found after this one was queued
+        if cost > best[path[4]]:
+            continue
+        
         # if GOALTEST(N) == true then return reverse(path)
         if goal_test(N):
-            return list(reversed(path))
+            return reverse_path(path)
         
         # else
         # children ← MOVEGEN(N)
         children = move_gen(N)
         
         # noloops ← REMOVESEEN(children, path)
-        noloops = remove_seen(children, path)
+        noloops = remove_seen(children, path, key)
         
         # newPaths ← MAKEPATHS(noloops, pathPair)
-        new_paths = make_paths(noloops, path_pair, k)
+        new_paths = make_paths(noloops, path, k)
         
         # OPEN ← SORT_cost(newPaths ++ tail OPEN)
-        OPEN = sorted(new_paths + OPEN, key=lambda x: x[1])
+        batch += 1
+        for index, new_path in enumerate(new_paths):
+            _, new_cost, _, _, M_key = new_path
+            if M_key in best and new_cost > best[M_key]:
+                continue
+            best[M_key] = new_cost
+            heapq.heappush(OPEN, (new_cost, -batch, index, new_path))
     
     # return empty list
     return []
 
 
-def remove_seen(children, path):
+def chain_bit(state_key):
+    return 1 << (hash(state_key) & 63)
+
+
+def remove_seen(children, path, key):
     """
     REMOVESEEN(children, path)
     Remove children that are already in the path (cycle detection)
     
     Parameters:
     - children: list of child nodes
-    - path: current path
+    - path: current path node
+    - key: state key function
     
     Returns:
-    - list of children not in path
+    - list of (child, key) pairs for the children not in path
     """
-    # if children is empty then return empty list
-    if not children:
-        return []
-    
-    # else
-    # M ← head children
-    M = children[0]
-    
-    # if OCCURSIN(M, path)
-    if occurs_in(M, path):
-        # then return REMOVESEEN(tail children, path)
-        return remove_seen(children[1:], path)
-    # else return M:REMOVESEEN(tail children, path)
-    else:
-        return [M] + remove_seen(children[1:], path)
+    # keep M unless OCCURSIN(M, path)
+    noloops = []
+    for M in children:
+        M_key = key(M)
+        if not occurs_in(M_key, path):
+            noloops.append((M, M_key))
+    return noloops
 
 
-def occurs_in(node, lst):
+def occurs_in(state_key, path):
     """
     OCCURSIN(node, list)
-    Check if node is in list
+    Check if a state is on the path
     
     Parameters:
-    - node: node to search for
-    - lst: list to search in
+    - state_key: key of the state to search for
+    - path: path node to search in
     
     Returns:
-    - True if node is in list, False otherwise
+    - True if the state is on the path, False otherwise
     """
-    # if list is empty then return False
-    if not lst:
+    # the bit is clear: no state on the path hashes to it
+    if not path[3] & chain_bit(state_key):
         return False
-    # else if node == head list then return True
-    elif node == lst[0]:
-        return True
-    # else return OCCURSIN(node, tail list)
-    else:
-        return occurs_in(node, lst[1:])
+    while path is not None:
+        if path[4] == state_key:
+            return True
+        path = path[2]
+    return False
 
 
-def make_paths(children, path_pair, k):
+def make_paths(children, path, k):
     """
     MAKEPATHS(children, pathPair)
     
     Parameters:
-    - children: list of child nodes
-    - path_pair: (path, cost) tuple
+    - children: list of (child, key) pairs
+    - path: (state, cost, parent, chain, key) path node
     - k: heuristic function
     
     Returns:
-    - list of new (path, cost) pairs
+    - list of new path nodes, one per child
     """
-    # if children is empty
-    if not children:
-        # then return empty list
-        return []
-    
-    # else
-    # (path, cost) ← pathPair
-    path, cost = path_pair
-    
-    # M ← head children
-    M = children[0]
-    
     # N ← head path
-    N = path[0]
-    
-    # return ([M,path], cost + k(N, M)): MAKEPATHS(tail children, pathPair)
-    new_path = [M] + path
-    new_cost = cost + k(N, M)
+    N, cost, _, chain, _ = path
     
-    return [(new_path, new_cost)] + make_paths(children[1:], path_pair, k)
+    # return ([M,path], cost + k(N, M)) for every M in children
+    return [(M, cost + k(N, M), path, chain | chain_bit(M_key), M_key) for M, M_key in children]
 
 
 # Example usage
@@ -4,6 +4,7 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import blindSearch.planning.bfs as bfs_planning
+import blindSearch.Configuration.dfs as dfs
 
 # Map Coloring as configuration CSP, similar style to nQueen
 
@@ -65,3 +66,10 @@ else:
     final = solution[-1]
     assign = {regions[i]: final[i] for i in range(len(regions))}
     print("Final assignment:", assign)
+
+# Every valid colouring, streamed depth first without building a list
+# count = 0
+# for coloring in dfs.dfs_all(start_node, movegen, goal_test):
+#     count += 1
+#     print(f"Coloring {count}:", {regions[i]: coloring[i] for i in range(len(regions))})
+# print(f"Total colorings: {count}")
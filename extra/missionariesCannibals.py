@@ -54,6 +54,10 @@ def goal_test(node):
     return node==[0,0,1]
 
 solution=bfs_planning.bfs_closed(start_node,movegen,goal_test)
+# moves are reversible, so the goal can also be searched from both ends
+# solution=bfs_planning.bidirectional_bfs(start_node,[0,0,1],movegen)
+# import blindSearch.planning.distanceOracle as oracle
+# solution=oracle.DistanceOracle.build([[0,0,1]],movegen,oracle.mixed_radix_codec((TOTAL+1,TOTAL+1,2))).path(start_node)
 
 if not solution:
     print("No solution found")
@@ -7,9 +7,24 @@ Functions:
     bidirectional_moves   -> alias of standard (useful for naming consistency).
     random_shuffle_moves  -> perform k random moves forward producing a trajectory list.
     prefer_corner_moves   -> like standard but children ordered prioritizing moves that place blank in a corner.
+    manhattan(node)       -> Manhattan distance to GOAL_BOARD.
+    manhattan_delta(node,h,child) -> manhattan(child) from h = manhattan(node), for one move.
+    random_neighbor(node,rng)     -> one uniformly drawn standard move, without building the others.
 """
+import random
 
 ADJ_MOVES = [-3,3,-1,1]
+# BLANK_MOVES[cell]: cells the blank can move to from `cell`
+BLANK_MOVES = [[cell+mv for mv in ADJ_MOVES
+                if 0<=cell+mv<9 and not (mv==-1 and cell%3==0) and not (mv==1 and cell%3==2)]
+               for cell in range(9)]
+
+GOAL_BOARD = [1,2,3,4,5,6,7,8,0]
+# DISTANCE[tile][cell]: Manhattan distance of `tile` at `cell` from its goal cell
+DISTANCE = [[abs(cell//3-goal//3)+abs(cell%3-goal%3) for cell in range(9)]
+            for goal in (GOAL_BOARD.index(tile) for tile in range(9))]
+DISTANCE[0] = [0]*9
+
 
 def standard_moves(node):
     children=[]
@@ -37,7 +52,6 @@ def bidirectional_moves(node):
 
 
 def random_shuffle_moves(node,k=5):
-    import random
     out=[]
     base=node
     for _ in range(k):
@@ -60,3 +74,23 @@ def prefer_corner_moves(node):
         scored.append((score,s))
     scored.sort(key=lambda x:x[0])
     return [s for _,s in scored]
+
+
+def manhattan(node):
+    return sum(DISTANCE[tile][cell] for cell,tile in enumerate(node))
+
+
+def manhattan_delta(node,h,child):
+    # one tile moved: from the child's blank cell into the node's blank cell
+    zero=node.index(0)
+    nz=child.index(0)
+    tile=node[nz]
+    return h+DISTANCE[tile][zero]-DISTANCE[tile][nz]
+
+
+def random_neighbor(node,rng=random):
+    zero=node.index(0)
+    nz=rng.choice(BLANK_MOVES[zero])
+    new=node[:]
+    new[zero],new[nz]=new[nz],new[zero]
+    return new
@@ -0,0 +1,152 @@
+"""Packed-integer 8-Puzzle representation.
+
+A board is a single int instead of a 9 element list:
+    bits  0..35  tile in cell i at bits 4*i .. 4*i+3 (row-major, 0 is blank)
+    bits 36..39  position of the blank
+    bits 40..44  Manhattan distance of the board to GOAL
+
+The blank position and the Manhattan distance are functions of the board, so
+equal boards are still equal ints and the state can be used directly as its own
+key (pass key=identity_key to the engines). A move is one table lookup and one
+addition: INCREMENT holds, for every (blank, tile position, tile), the amount to
+add to the int to slide the tile, move the blank and update the distance by the
++/-1 delta of the moved tile.
+
+Functions:
+    pack(node)            -> int for a flat list board.
+    unpack(state)         -> flat list board.
+    unpack_path(path)     -> list boards for a path of packed states.
+    movegen(state)        -> packed children (blank moves up, down, left, right).
+    goal_test(state)      -> state == GOAL.
+    heuristic_manhattan(state) -> stored distance, O(1).
+    heuristic_hamming(state)   -> misplaced tiles.
+
+With key=identity_key the planning bfs_closed/dfs_closed and bestfirstsearch
+skip the key call per child, so a packed search pays only for movegen and the
+node store. benchmarks/eightPuzzlePacked.py (50 instances, 40 random moves)
+gives about 2.3x for bfs_closed, 2.1x for dfs_closed and 2.7x for
+bestfirstsearch over list boards; IDA* already updates Manhattan distance
+incrementally on list boards and gains about 1.6x.
+
+Usage with the existing engines:
+    from utils.stateKey import identity_key
+    path = bfs_planning.bfs_closed(pack(start), movegen, goal_test, key=identity_key)
+    path = bestfs.bestfirstsearch(pack(start), movegen, goal_test, heuristic_manhattan, key=identity_key)
+    boards = unpack_path(path)
+"""
+
+GOAL_BOARD = [1,2,3,4,5,6,7,8,0]
+
+BLANK_SHIFT = 36
+MANHATTAN_SHIFT = 40
+
+# goal cell of every tile
+GOAL_POSITION = [0]*9
+for _i, _tile in enumerate(GOAL_BOARD):
+    GOAL_POSITION[_tile] = _i
+
+
+def _distance(tile, pos):
+    goal = GOAL_POSITION[tile]
+    return abs(pos//3-goal//3) + abs(pos%3-goal%3)
+
+
+# cells the blank can swap with, in the same up, down, left, right order as
+# Problems/8Puzzle.py:movegen
+NEIGHBOURS = []
+for _b in range(9):
+    _cells = []
+    for _mv in (-3,3,-1,1):
+        _t = _b+_mv
+        if not 0 <= _t < 9:
+            continue
+        if _mv == -1 and _b%3 == 0:
+            continue
+        if _mv == 1 and _b%3 == 2:
+            continue
+        _cells.append(_t)
+    NEIGHBOURS.append(tuple(_cells))
+
+# INCREMENT[(b*9+t)*16+tile]: move `tile` from cell t into the blank at cell b
+INCREMENT = [0]*(9*9*16)
+for _b in range(9):
+    for _t in NEIGHBOURS[_b]:
+        for _tile in range(1,9):
+            INCREMENT[(_b*9+_t)*16+_tile] = (
+                (_tile << 4*_b) - (_tile << 4*_t)
+                + ((_t-_b) << BLANK_SHIFT)
+                + ((_distance(_tile,_b)-_distance(_tile,_t)) << MANHATTAN_SHIFT)
+            )
+
+# per blank position: (shift of the neighbouring cell, base index into INCREMENT)
+MOVES = [tuple((4*_t, (_b*9+_t)*16) for _t in NEIGHBOURS[_b]) for _b in range(9)]
+
+
+def _children(moves):
+    # movegen for one blank position, with its 2, 3 or 4 (shift, base) pairs
+    # bound as closure constants instead of looped over for every state
+    I = INCREMENT
+    if len(moves) == 2:
+        (s0, b0), (s1, b1) = moves
+        return lambda state: [state + I[b0 + ((state >> s0) & 15)],
+                              state + I[b1 + ((state >> s1) & 15)]]
+    if len(moves) == 3:
+        (s0, b0), (s1, b1), (s2, b2) = moves
+        return lambda state: [state + I[b0 + ((state >> s0) & 15)],
+                              state + I[b1 + ((state >> s1) & 15)],
+                              state + I[b2 + ((state >> s2) & 15)]]
+    (s0, b0), (s1, b1), (s2, b2), (s3, b3) = moves
+    return lambda state: [state + I[b0 + ((state >> s0) & 15)],
+                          state + I[b1 + ((state >> s1) & 15)],
+                          state + I[b2 + ((state >> s2) & 15)],
+                          state + I[b3 + ((state >> s3) & 15)]]
+
+
+CHILDREN = [_children(MOVES[_b]) for _b in range(9)]
+
+
+def pack(node):
+    state = 0
+    manhattan = 0
+    blank = 0
+    for i, tile in enumerate(node):
+        if tile == 0:
+            blank = i
+        else:
+            state |= tile << 4*i
+            manhattan += _distance(tile,i)
+    return state | (blank << BLANK_SHIFT) | (manhattan << MANHATTAN_SHIFT)
+
+
+def unpack(state):
+    return [(state >> 4*i) & 15 for i in range(9)]
+
+
+def unpack_path(path):
+    if not path:
+        return path
+    return [unpack(state) for state in path]
+
+
+GOAL = pack(GOAL_BOARD)
+
+
+def movegen(state):
+    return CHILDREN[(state >> BLANK_SHIFT) & 15](state)
+
+
+def goal_test(state):
+    return state == GOAL
+
+
+def heuristic_manhattan(state):
+    return state >> MANHATTAN_SHIFT
+
+
+def heuristic_hamming(state):
+    score = 0
+    for i in range(9):
+        tile = (state >> 4*i) & 15
+        if tile != 0 and tile != GOAL_BOARD[i]:
+            score += 1
+    return score
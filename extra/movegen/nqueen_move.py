@@ -11,7 +11,11 @@ Functions:
     move_single_queen(node)       -> move one queen within its row (all alt columns).
     adjacent_column_shift(node)   -> shift each queen +/-1 column (wrap) (local mild change).
     diagonal_swap(node)           -> swap two queens if they share a diagonal (focus attacking pairs).
+    random_neighbor(node,rng)     -> one uniformly drawn move_single_queen neighbour.
+    attacking_pairs(node)         -> number of pairs of queens attacking each other (complete assignment).
+    attacking_pairs_delta(node,h,child) -> attacking_pairs(child) from h = attacking_pairs(node), one queen moved, O(n).
 """
+import random
 
 
 def is_safe_partial(node,row,col):
@@ -86,3 +90,34 @@ def diagonal_swap(node):
                 new[i],new[j]=new[j],new[i]
                 children.append(new)
     return children
+
+
+def random_neighbor(node,rng=random):
+    """One queen moved to another column of its row, drawn uniformly."""
+    n=len(node)
+    if n<2:
+        return None
+    r=rng.randrange(n)
+    c=rng.randrange(n-1)
+    if c>=node[r]:
+        c+=1
+    new=node[:]
+    new[r]=c
+    return new
+
+
+def attacking_pairs(node):
+    n=len(node)
+    return sum(1 for i in range(n) for j in range(i+1,n)
+               if node[i]==node[j] or abs(node[i]-node[j])==j-i)
+
+
+def attacking_pairs_delta(node,h,child):
+    r=next(i for i,(old,new) in enumerate(zip(node,child)) if old!=new)
+    before=after=0
+    for k,c in enumerate(node):
+        if k==r:
+            continue
+        before+=node[r]==c or abs(node[r]-c)==abs(r-k)
+        after+=child[r]==c or abs(child[r]-c)==abs(r-k)
+    return h+after-before
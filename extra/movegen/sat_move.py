@@ -9,7 +9,12 @@ Functions:
     random_flip_k(node,k)     -> sample k random single-variable flips (non‑duplicate).
     flip_until_true(node,eval)-> greedy improving single flips (eval lower = better).
     single_improving_flip(node,eval) -> the best single flip (tie keep first) or [] if none.
+    random_neighbor(node,rng) -> one uniformly drawn single-variable flip.
+    UnsatisfiedClauses(clauses) -> evaluator: number of clauses node leaves unsatisfied;
+        its incremental(node,h,child) rescores only the clauses of the flipped variable.
+        Clauses are lists of non-zero ints (DIMACS style): v for x_v, -v for not x_v, v from 1.
 """
+import random
 
 
 def flip_all(node):
@@ -60,7 +65,6 @@ def flip_until_true(node,evaluator):
 
 def random_flip_k(node,k=3):
     """Return up to k random distinct single-variable flips (subset of flip_all)."""
-    import random
     indices=list(range(len(node)))
     random.shuffle(indices)
     children=[]
@@ -84,3 +88,36 @@ def single_improving_flip(node,evaluator):
             best_score=sc
             best=c
     return [best] if best is not None else []
+
+
+def random_neighbor(node,rng=random):
+    if not node:
+        return None
+    new=node[:]
+    i=rng.randrange(len(new))
+    new[i]=1-new[i]
+    return new
+
+
+class UnsatisfiedClauses:
+    def __init__(self,clauses):
+        self.clauses=[list(clause) for clause in clauses]
+        # clauses_of[i]: the clauses mentioning node[i]
+        variables=max((abs(lit) for clause in self.clauses for lit in clause),default=0)
+        self.clauses_of=[[] for _ in range(variables)]
+        for clause in self.clauses:
+            for i in {abs(lit)-1 for lit in clause}:
+                self.clauses_of[i].append(clause)
+
+    @staticmethod
+    def satisfied(node,clause):
+        return any((node[lit-1]==1) if lit>0 else (node[-lit-1]==0) for lit in clause)
+
+    def __call__(self,node):
+        return sum(1 for clause in self.clauses if not self.satisfied(node,clause))
+
+    def incremental(self,node,h,child):
+        i=next(i for i,(old,new) in enumerate(zip(node,child)) if old!=new)
+        for clause in self.clauses_of[i]:
+            h+=self.satisfied(node,clause)-self.satisfied(child,clause)
+        return h
@@ -8,46 +8,62 @@ Functions:
     insert_city(node)  -> remove city i and insert at j.
     three_opt(node)    -> all 3-edge exchanges (subset canonical cases to limit explosion).
     double_bridge(node)-> 4-segment rearrangement (useful for escaping local minima).
+
+Every neighbourhood comes in three forms: the list above, a generator
+iter_<name>(node) yielding the same children in the same order one at a time
+(for first-improvement search, which stops at the first better child), and
+sample_<name>(node, k, rng) with k distinct children drawn uniformly without
+building the others (all of them, shuffled, when there are at most k).
+random_neighbor(node, rng) is a single uniformly drawn 2-opt child, for
+simulated annealing.
+
+Move objects (for the moves= / random_move= modes of the local and stochastic
+searches): each neighbourhood also exists as a generator of moves that carry
+their cost change, computed in O(1) from a symmetric distance matrix
+dist[a][b] indexed by city, and only build the new tour in move.apply(tour).
+move.attributes(tour) gives the (added, removed) edges as (low, high) city
+pairs, the tabu attributes used by localSearch/tabuSearch.py.
+
+    two_opt_moves(node, dist), swap_moves, insert_moves, three_opt_moves,
+    double_bridge_moves   -> the neighbourhoods above as moves, in the same order.
+    random_two_opt_move(node, dist, rng), random_swap_move, random_insert_move,
+    random_three_opt_move -> one uniformly drawn move (None if there is none).
+    sample_two_opt_moves(node, dist, k, rng), sample_swap_moves, sample_insert_moves,
+    sample_three_opt_moves, sample_double_bridge_moves -> k distinct moves.
+    tour_cost(node, dist) -> length of the closed tour.
+    city_matrix(graph)    -> dist for cities numbered 1..n from a 0-based matrix.
 """
+import random
+from itertools import combinations, permutations
+from math import comb, perm
 
 
-def two_opt(node):
-    children=[]
+def iter_two_opt(node):
     for i in range(1,len(node)-1):
         for j in range(i+1,len(node)):
-            new=node[:i]+node[i:j+1][::-1]+node[j+1:]
-            children.append(new)
-    return children
+            yield node[:i]+node[i:j+1][::-1]+node[j+1:]
 
 
-def swap_cities(node):
-    children=[]
+def iter_swap_cities(node):
     for i in range(1,len(node)):
         for j in range(i+1,len(node)):
             new=node[:]
             new[i],new[j]=new[j],new[i]
-            children.append(new)
-    return children
+            yield new
 
 
-def insert_city(node):
-    children=[]
+def iter_insert_city(node):
     for i in range(1,len(node)):
         for j in range(1,len(node)):
             if i==j: continue
             perm=node[:]
             city=perm.pop(i)
             perm.insert(j,city)
-            children.append(perm)
-    return children
+            yield perm
 
 
-def three_opt(node):
-    """Generate neighbors via a limited 3-opt (choose i<j<k and reconnect in 3 common permutations).
-    Avoid permutations equivalent to 2-opt. Keeps start city fixed.
-    """
+def iter_three_opt(node):
     n=len(node)
-    children=[]
     for i in range(1,n-3):
         for j in range(i+1,n-2):
             for k in range(j+1,n-1):
@@ -56,27 +72,376 @@ def three_opt(node):
                 C=node[j:k]
                 D=node[k:]
                 # permutations (selected)
-                children.append(A+B[::-1]+C+D)      # reverse B
-                children.append(A+B+C[::-1]+D)      # reverse C
-                children.append(A+C+B+D)            # swap B and C
-    return children
+                yield A+B[::-1]+C+D      # reverse B
+                yield A+B+C[::-1]+D      # reverse C
+                yield A+C+B+D            # swap B and C
 
 
-def double_bridge(node):
-    """Double-bridge move (common in Lin-Kernighan) splitting tour into 4 segments.
-    Pattern: (A|B|C|D) -> A C B D to create deeper perturbation.
-    """
+def iter_double_bridge(node):
     n=len(node)
     if n<9:
-        return []
-    children=[]
+        return
     # choose three split points
     for a in range(1,n-6):
         for b in range(a+2,n-4):
             for c in range(b+2,n-2):
-                A=node[:a]
-                B=node[a:b]
-                C=node[b:c]
-                D=node[c:]
-                children.append(A+C+B+D)
-    return children
+                yield node[:a]+node[b:c]+node[a:b]+node[c:]
+
+
+def two_opt(node):
+    return list(iter_two_opt(node))
+
+
+def swap_cities(node):
+    return list(iter_swap_cities(node))
+
+
+def insert_city(node):
+    return list(iter_insert_city(node))
+
+
+def three_opt(node):
+    """Generate neighbors via a limited 3-opt (choose i<j<k and reconnect in 3 common permutations).
+    Avoid permutations equivalent to 2-opt. Keeps start city fixed.
+    """
+    return list(iter_three_opt(node))
+
+
+def double_bridge(node):
+    """Double-bridge move (common in Lin-Kernighan) splitting tour into 4 segments.
+    Pattern: (A|B|C|D) -> A C B D to create deeper perturbation.
+    """
+    return list(iter_double_bridge(node))
+
+
+def random_neighbor(node, rng=random):
+    if len(node) < 3:
+        return None
+    i, j = sorted(rng.sample(range(1, len(node)), 2))
+    return node[:i]+node[i:j+1][::-1]+node[j+1:]
+
+
+def tour_cost(node, dist):
+    return sum(dist[node[i-1]][node[i]] for i in range(len(node)))
+
+
+def city_matrix(graph):
+    """graph[a-1][b-1] as dist[a][b], for tours over cities 1..n."""
+    return [[0]*(len(graph)+1)]+[[0]+list(row) for row in graph]
+
+
+class TwoOpt:
+    """Reverse node[i:j+1]."""
+    __slots__ = ("i", "j", "delta")
+
+    def __init__(self, i, j, delta):
+        self.i, self.j, self.delta = i, j, delta
+
+    def apply(self, node):
+        i, j = self.i, self.j
+        return node[:i]+node[i:j+1][::-1]+node[j+1:]
+
+    def attributes(self, node):
+        return two_opt_edges(node, self.i, self.j)
+
+    def __repr__(self):
+        return f"TwoOpt({self.i}, {self.j}, delta={self.delta})"
+
+
+class Swap:
+    """Exchange the cities at positions i and j."""
+    __slots__ = ("i", "j", "delta")
+
+    def __init__(self, i, j, delta):
+        self.i, self.j, self.delta = i, j, delta
+
+    def apply(self, node):
+        new = node[:]
+        new[self.i], new[self.j] = new[self.j], new[self.i]
+        return new
+
+    def attributes(self, node):
+        return swap_edges(node, self.i, self.j)
+
+    def __repr__(self):
+        return f"Swap({self.i}, {self.j}, delta={self.delta})"
+
+
+class Insert:
+    """Remove the city at position i and insert it at position j."""
+    __slots__ = ("i", "j", "delta")
+
+    def __init__(self, i, j, delta):
+        self.i, self.j, self.delta = i, j, delta
+
+    def apply(self, node):
+        new = node[:]
+        new.insert(self.j, new.pop(self.i))
+        return new
+
+    def attributes(self, node):
+        return insert_edges(node, self.i, self.j)
+
+    def __repr__(self):
+        return f"Insert({self.i}, {self.j}, delta={self.delta})"
+
+
+REVERSE_B, REVERSE_C, SWAP_BC = 0, 1, 2
+
+
+class ThreeOpt:
+    """With A, B, C, D = node[:i], node[i:j], node[j:k], node[k:]: A B' C D
+    (REVERSE_B), A B C' D (REVERSE_C) or A C B D (SWAP_BC)."""
+    __slots__ = ("i", "j", "k", "kind", "delta")
+
+    def __init__(self, i, j, k, kind, delta):
+        self.i, self.j, self.k, self.kind, self.delta = i, j, k, kind, delta
+
+    def apply(self, node):
+        i, j, k = self.i, self.j, self.k
+        if self.kind == REVERSE_B:
+            return node[:i]+node[i:j][::-1]+node[j:]
+        if self.kind == REVERSE_C:
+            return node[:j]+node[j:k][::-1]+node[k:]
+        return node[:i]+node[j:k]+node[i:j]+node[k:]
+
+    def attributes(self, node):
+        return three_opt_edges(node, self.i, self.j, self.k, self.kind)
+
+    def __repr__(self):
+        return f"ThreeOpt({self.i}, {self.j}, {self.k}, kind={self.kind}, delta={self.delta})"
+
+
+def edge(a, b):
+    return (a, b) if a <= b else (b, a)
+
+
+def two_opt_edges(node, i, j):
+    n = len(node)
+    a, b, c, e = node[i-1], node[i], node[j], node[(j+1) % n]
+    return (edge(a, c), edge(b, e)), (edge(a, b), edge(c, e))
+
+
+def swap_edges(node, i, j):
+    n = len(node)
+    p, b, q = node[i-1], node[i], node[(i+1) % n]
+    r, c, s = node[j-1], node[j], node[(j+1) % n]
+    if j == i+1:
+        return (edge(p, c), edge(b, s)), (edge(p, b), edge(c, s))
+    return ((edge(p, c), edge(c, q), edge(r, b), edge(b, s)),
+            (edge(p, b), edge(b, q), edge(r, c), edge(c, s)))
+
+
+def insert_edges(node, i, j):
+    n = len(node)
+    p, b, q = node[i-1], node[i], node[(i+1) % n]
+    if j < i:
+        x, y = node[j-1], node[j]
+    else:
+        x, y = node[j], node[(j+1) % n]
+    return (edge(p, q), edge(x, b), edge(b, y)), (edge(p, b), edge(b, q), edge(x, y))
+
+
+def three_opt_edges(node, i, j, k, kind):
+    a, b1, b2 = node[i-1], node[i], node[j-1]
+    c1, c2, d1 = node[j], node[k-1], node[k]
+    if kind == REVERSE_B:
+        return (edge(a, b2), edge(b1, c1)), (edge(a, b1), edge(b2, c1))
+    if kind == REVERSE_C:
+        return (edge(b2, c2), edge(c1, d1)), (edge(b2, c1), edge(c2, d1))
+    return ((edge(a, c1), edge(c2, b1), edge(b2, d1)),
+            (edge(a, b1), edge(b2, c1), edge(c2, d1)))
+
+
+def two_opt_delta(node, dist, i, j):
+    n = len(node)
+    a, b, c, e = node[i-1], node[i], node[j], node[(j+1) % n]
+    return dist[a][c]+dist[b][e]-dist[a][b]-dist[c][e]
+
+
+def swap_delta(node, dist, i, j):
+    n = len(node)
+    p, b, q = node[i-1], node[i], node[(i+1) % n]
+    r, c, s = node[j-1], node[j], node[(j+1) % n]
+    if j == i+1:
+        return dist[p][c]+dist[b][s]-dist[p][b]-dist[c][s]
+    return (dist[p][c]+dist[c][q]+dist[r][b]+dist[b][s]
+            - dist[p][b]-dist[b][q]-dist[r][c]-dist[c][s])
+
+
+def insert_delta(node, dist, i, j):
+    n = len(node)
+    p, b, q = node[i-1], node[i], node[(i+1) % n]
+    # the city lands between x and y of the tour without it
+    if j < i:
+        x, y = node[j-1], node[j]
+    else:
+        x, y = node[j], node[(j+1) % n]
+    return dist[p][q]-dist[p][b]-dist[b][q]+dist[x][b]+dist[b][y]-dist[x][y]
+
+
+def three_opt_delta(node, dist, i, j, k, kind):
+    a, b1, b2 = node[i-1], node[i], node[j-1]
+    c1, c2, d1 = node[j], node[k-1], node[k]
+    if kind == REVERSE_B:
+        return dist[a][b2]+dist[b1][c1]-dist[a][b1]-dist[b2][c1]
+    if kind == REVERSE_C:
+        return dist[b2][c2]+dist[c1][d1]-dist[b2][c1]-dist[c2][d1]
+    return (dist[a][c1]+dist[c2][b1]+dist[b2][d1]
+            - dist[a][b1]-dist[b2][c1]-dist[c2][d1])
+
+
+def two_opt_moves(node, dist):
+    n = len(node)
+    for i in range(1, n-1):
+        a, b = node[i-1], node[i]
+        dist_a, dist_b = dist[a], dist[b]
+        ab = dist_a[b]
+        for j in range(i+1, n):
+            c, e = node[j], node[(j+1) % n]
+            yield TwoOpt(i, j, dist_a[c]+dist_b[e]-ab-dist[c][e])
+
+
+def swap_moves(node, dist):
+    for i in range(1, len(node)):
+        for j in range(i+1, len(node)):
+            yield Swap(i, j, swap_delta(node, dist, i, j))
+
+
+def insert_moves(node, dist):
+    for i in range(1, len(node)):
+        for j in range(1, len(node)):
+            if i != j:
+                yield Insert(i, j, insert_delta(node, dist, i, j))
+
+
+def three_opt_moves(node, dist):
+    n = len(node)
+    for i in range(1, n-3):
+        for j in range(i+1, n-2):
+            for k in range(j+1, n-1):
+                for kind in (REVERSE_B, REVERSE_C, SWAP_BC):
+                    yield ThreeOpt(i, j, k, kind, three_opt_delta(node, dist, i, j, k, kind))
+
+
+def double_bridge_moves(node, dist):
+    n = len(node)
+    if n < 9:
+        return
+    for a in range(1, n-6):
+        for b in range(a+2, n-4):
+            for c in range(b+2, n-2):
+                yield ThreeOpt(a, b, c, SWAP_BC, three_opt_delta(node, dist, a, b, c, SWAP_BC))
+
+
+def random_two_opt_move(node, dist, rng=random):
+    if len(node) < 3:
+        return None
+    i, j = sorted(rng.sample(range(1, len(node)), 2))
+    return TwoOpt(i, j, two_opt_delta(node, dist, i, j))
+
+
+def random_swap_move(node, dist, rng=random):
+    if len(node) < 3:
+        return None
+    i, j = sorted(rng.sample(range(1, len(node)), 2))
+    return Swap(i, j, swap_delta(node, dist, i, j))
+
+
+def random_insert_move(node, dist, rng=random):
+    if len(node) < 3:
+        return None
+    i, j = rng.sample(range(1, len(node)), 2)
+    return Insert(i, j, insert_delta(node, dist, i, j))
+
+
+def random_three_opt_move(node, dist, rng=random):
+    if len(node) < 5:
+        return None
+    i, j, k = sorted(rng.sample(range(1, len(node)-1), 3))
+    kind = rng.randrange(3)
+    return ThreeOpt(i, j, k, kind, three_opt_delta(node, dist, i, j, k, kind))
+
+
+def sample_distinct(draw, total, k, everything, rng):
+    """k distinct draw() results; everything() shuffled when total <= k."""
+    if total <= k:
+        picked = list(everything())
+        rng.shuffle(picked)
+        return picked
+    picked = {}  # insertion ordered, so a seeded rng gives a reproducible sample
+    while len(picked) < k:
+        picked[draw()] = None
+    return list(picked)
+
+
+def two_opt_indices(n, k, rng):
+    cities = range(1, n)
+    return sample_distinct(lambda: tuple(sorted(rng.sample(cities, 2))),
+                           comb(n-1, 2), k, lambda: combinations(cities, 2), rng)
+
+
+def insert_indices(n, k, rng):
+    cities = range(1, n)
+    return sample_distinct(lambda: tuple(rng.sample(cities, 2)),
+                           perm(n-1, 2), k, lambda: permutations(cities, 2), rng)
+
+
+def three_opt_indices(n, k, rng):
+    cities = range(1, n-1)
+    kinds = (REVERSE_B, REVERSE_C, SWAP_BC)
+    return sample_distinct(lambda: (*sorted(rng.sample(cities, 3)), rng.choice(kinds)),
+                           3*comb(n-2, 3), k,
+                           lambda: ((*ijk, kind) for ijk in combinations(cities, 3) for kind in kinds), rng)
+
+
+def double_bridge_indices(n, k, rng):
+    # a < b < c with gaps of at least 2 are a+0 < b'+1 < c'+2 for any 3 of 1..n-5
+    if n < 9:
+        return []
+    cities = range(1, n-4)
+    spread = lambda abc: (abc[0], abc[1]+1, abc[2]+2)
+    return sample_distinct(lambda: spread(sorted(rng.sample(cities, 3))),
+                           comb(n-5, 3), k, lambda: map(spread, combinations(cities, 3)), rng)
+
+
+def sample_two_opt(node, k, rng=random):
+    return [TwoOpt(i, j, None).apply(node) for i, j in two_opt_indices(len(node), k, rng)]
+
+
+def sample_swap_cities(node, k, rng=random):
+    return [Swap(i, j, None).apply(node) for i, j in two_opt_indices(len(node), k, rng)]
+
+
+def sample_insert_city(node, k, rng=random):
+    return [Insert(i, j, None).apply(node) for i, j in insert_indices(len(node), k, rng)]
+
+
+def sample_three_opt(node, k, rng=random):
+    return [ThreeOpt(i, j, l, kind, None).apply(node) for i, j, l, kind in three_opt_indices(len(node), k, rng)]
+
+
+def sample_double_bridge(node, k, rng=random):
+    return [ThreeOpt(a, b, c, SWAP_BC, None).apply(node) for a, b, c in double_bridge_indices(len(node), k, rng)]
+
+
+def sample_two_opt_moves(node, dist, k, rng=random):
+    return [TwoOpt(i, j, two_opt_delta(node, dist, i, j)) for i, j in two_opt_indices(len(node), k, rng)]
+
+
+def sample_swap_moves(node, dist, k, rng=random):
+    return [Swap(i, j, swap_delta(node, dist, i, j)) for i, j in two_opt_indices(len(node), k, rng)]
+
+
+def sample_insert_moves(node, dist, k, rng=random):
+    return [Insert(i, j, insert_delta(node, dist, i, j)) for i, j in insert_indices(len(node), k, rng)]
+
+
+def sample_three_opt_moves(node, dist, k, rng=random):
+    return [ThreeOpt(i, j, l, kind, three_opt_delta(node, dist, i, j, l, kind))
+            for i, j, l, kind in three_opt_indices(len(node), k, rng)]
+
+
+def sample_double_bridge_moves(node, dist, k, rng=random):
+    return [ThreeOpt(a, b, c, SWAP_BC, three_opt_delta(node, dist, a, b, c, SWAP_BC))
+            for a, b, c in double_bridge_indices(len(node), k, rng)]
@@ -5,6 +5,8 @@ State: [x,y] amounts in jug A (cap a_cap) and jug B (cap b_cap).
 Functions:
     classic_moves(node,a,b) -> all legal primitive operations (fill, empty, pour).
     greedy_toward(target)   -> wrapper producing children ordered by proximity to target.
+    classic_predecessors(node,a,b) -> states that reach node with one classic move
+                               (pouring is not reversible, so bidirectional search needs this).
 """
 
 
@@ -44,3 +46,37 @@ def greedy_toward(node,a_cap,b_cap,target):
         scored.append((score,m))
     scored.sort(key=lambda x:x[0])
     return [m for _,m in scored]
+
+
+def classic_predecessors(node,a_cap,b_cap):
+    """Inverse of classic_moves: every state p with node in classic_moves(p)."""
+    x,y=node
+    parents=[]
+    # filled A / filled B from any lower level
+    if x==a_cap:
+        parents.extend([px,y] for px in range(a_cap))
+    if y==b_cap:
+        parents.extend([x,py] for py in range(b_cap))
+    # emptied A / emptied B from any higher level
+    if x==0:
+        parents.extend([px,y] for px in range(1,a_cap+1))
+    if y==0:
+        parents.extend([x,py] for py in range(1,b_cap+1))
+    # poured A->B: stopped because A ran dry or B filled up
+    for amt in range(1,y+1):
+        px,py=x+amt,y-amt
+        if px<=a_cap and (x==0 or y==b_cap):
+            parents.append([px,py])
+    # poured B->A: stopped because B ran dry or A filled up
+    for amt in range(1,x+1):
+        px,py=x-amt,y+amt
+        if py<=b_cap and (y==0 or x==a_cap):
+            parents.append([px,py])
+    uniq=[]
+    seen={tuple(node)}
+    for p in parents:
+        t=tuple(p)
+        if t not in seen:
+            seen.add(t)
+            uniq.append(p)
+    return uniq
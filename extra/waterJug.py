@@ -69,6 +69,17 @@ def goal_test(node):
 # Planning problem (use BFS planning for shortest sequence)
 solution=bfs_planning.bfs_closed(start_node,movegen,goal_test)
 
+# Bidirectional BFS needs one explicit goal state and the inverse moves (pouring is not reversible)
+# import extra.movegen.waterjug_move as waterjug_move
+# solution=bfs_planning.bidirectional_bfs(start_node,[TARGET,0],movegen,lambda node: waterjug_move.classic_predecessors(node,A_CAP,B_CAP))
+
+# Many queries towards the same target: one backward BFS from every goal state, then paths by table lookup
+# import extra.movegen.waterjug_move as waterjug_move
+# import blindSearch.planning.distanceOracle as oracle
+# codec=oracle.mixed_radix_codec((A_CAP+1,B_CAP+1))
+# goals=[state for state in map(codec[1],range(codec[2])) if goal_test(state)]
+# solution=oracle.DistanceOracle.build(goals,lambda node: waterjug_move.classic_predecessors(node,A_CAP,B_CAP),codec).path(start_node)
+
 # solution=dfs_planning.dfs_closed(start_node,movegen,goal_test)
 # solution=dfid_planning.dfid(start_node,movegen,goal_test)
 
@@ -50,6 +50,8 @@ def goal_test(node):
     return node==[1,1,1,1]
 
 solution=bfs_planning.bfs_closed(start_node,movegen,goal_test)
+# moves are reversible, so the goal can also be searched from both ends
+# solution=bfs_planning.bidirectional_bfs(start_node,[1,1,1,1],movegen)
 
 if not solution:
     print("No solution found")
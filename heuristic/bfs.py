@@ -1,35 +1,42 @@
-def findLink(node,closed):
-    for n,p,h in closed:
-        if n==node:
-            return (n,p,h)
-    return None
+import heapq
+from itertools import count
 
+from utils.stateKey import resolve_key, identity_key
+from utils.nodeStore import NodeStore
+from utils.searchStats import reports_stats
 
-def reconstruct_path(nodePair,closed):
-    node,parent,_=nodePair
-    path=[]
-    path.append(node)
-    while parent is not None:
-        path.append(parent)
-        node,parent,_=findLink(parent,closed)
-    return path[::-1]
 
 
 
+@reports_stats(movegen="movegen", goal_test="goal_test", heuristic="heuristic")
+def bestfirstsearch(start_node, movegen, goal_test, heuristic, key=None, decode=None, stats=None):
+    """Greedy best-first search: always expands the open node with the lowest
+    heuristic value.
 
-def bestfirstsearch(start_node, movegen, goal_test, heuristic):
-    open=[(start_node,None,heuristic(start_node))]
-    closed=[]
+    open is a binary heap of (h, tie, node, id) entries. tie is an insertion
+    counter, so nodes with equal h come out in the order they were generated
+    and states themselves are never compared. Every generated state is
+    interned in the node store, which is both the hashed open/closed table and
+    the parent links used to rebuild the path. Returns the path to the first
+    goal popped, or False.
+    """
+    key=resolve_key(key)
+    store=NodeStore(key,decode)  # every state in open or closed, with its parent id
+    ids=store.ids
+    add=store.add
+    own_key=key is identity_key  # e.g. packed boards: no key call per child
+    tie=count()
+    open=[(heuristic(start_node),next(tie),start_node,store.add(start_node,key(start_node)))]
     while open:
-        nodePair = open[0]
-        node = nodePair[0]
+        _,_,node,node_id = heapq.heappop(open)
         if goal_test(node):
-            return reconstruct_path(nodePair,closed)
-        else:
-            closed.append(nodePair)
-            childs=movegen(node)
-            childs=[child for child in childs if child not in [n for n,p,h in closed] and child not in [n for n,p,h in open]]
-            child_pair=[(child,node,heuristic(child)) for child in childs]
-            child_pair.sort(key=lambda x: x[2])
-            open=child_pair+open[1:]
+            return store.path(node_id)
+        for child in movegen(node):
+            child_key=child if own_key else key(child)
+            if child_key not in ids:
+                heapq.heappush(open,(heuristic(child),next(tie),child,add(child,child_key,node_id)))
+            elif stats is not None:
+                stats.duplicates_pruned+=1
+        if stats is not None:
+            stats.observe(len(open),len(store)-len(open))
     return False
@@ -0,0 +1,89 @@
+"""Iterative deepening A* (IDA*).
+
+Depth-first searches bounded by f = g + h. Each iteration expands every node
+with f <= threshold, and the next threshold is the smallest f that exceeded it.
+Only the current path is kept (utils/pathWalk.py), so memory is O(b*depth)
+however many nodes are expanded.
+
+A child equal to the parent of its parent (the move that undoes the last one)
+is never searched. With incremental(node, h, child) the heuristic of a child
+is derived from its parent's value instead of being recomputed, e.g.
+extra/movegen/eightpuzzle_move.manhattan_delta for list boards (packed boards
+already carry their Manhattan distance, see eightpuzzle_packed).
+"""
+from math import inf
+
+from utils.stateKey import resolve_key
+from utils.searchStats import reports_stats
+from utils.pathWalk import PathWalk
+from extra.a_star import unit_cost
+
+
+def bounded_search(start, h_start, movegen, goal_test, heuristic, cost, key, incremental, threshold, stats=None):
+    """One IDA* iteration. Returns (path or False, nodes expanded, next threshold)."""
+    if goal_test(start):
+        return [start], 0, threshold
+    path=[start]
+    keys=[key(start)]
+    g=[0]
+    h=[h_start]
+
+    def backtrack():
+        path.pop()
+        keys.pop()
+        g.pop()
+        h.pop()
+
+    walk=PathWalk(movegen(start),backtrack)
+    expanded=1
+    minimum=inf  # smallest f above the threshold
+    for child in walk:
+        child_key=key(child)
+        if len(keys)>1 and child_key==keys[-2]:
+            continue
+        node=path[-1]
+        child_g=g[-1]+cost(node, child)
+        child_h=incremental(node, h[-1], child) if incremental is not None else heuristic(child)
+        f=child_g+child_h
+        if f>threshold:
+            if f<minimum:
+                minimum=f
+            continue
+        if goal_test(child):
+            path.append(child)
+            return path, expanded, threshold
+        path.append(child)
+        keys.append(child_key)
+        g.append(child_g)
+        h.append(child_h)
+        walk.descend(movegen(child))
+        expanded+=1
+        if stats is not None:
+            stats.observe(len(path))
+    return False, expanded, minimum
+
+
+@reports_stats(movegen="movegen", goal_test="goal_test", heuristic=("heuristic", "incremental"))
+def ida_star(start, movegen, goal_test, heuristic, cost=unit_cost, key=None, incremental=None, verbose=True, stats=None):
+    """Optimal path from start to a goal for an admissible heuristic, or False.
+
+    cost(node, child) is the edge cost (1 per move by default). key is only
+    used to recognise the move back to the grandparent. The threshold and
+    nodes expanded of every iteration are printed when verbose, and recorded in
+    stats.iterations.
+    """
+    key=resolve_key(key)
+    h_start=heuristic(start)
+    threshold=h_start
+    while True:
+        result, expanded, next_threshold = bounded_search(start, h_start, movegen, goal_test, heuristic, cost, key, incremental, threshold, stats)
+        if verbose:
+            print(f"Threshold: {threshold}, nodes expanded: {expanded}")
+        if stats is not None:
+            stats.iterations.append({"threshold": threshold, "nodes_expanded": expanded})
+        if result is not False:
+            return result
+        # every path was exhausted below the threshold
+        if next_threshold==inf:
+            return False
+        threshold=next_threshold
@@ -0,0 +1,187 @@
+"""Additive disjoint pattern databases for sliding tile puzzles.
+
+Boards are flat lists (or tuples) of width*width cells, row-major, 0 is the
+blank, as in extra/movegen/eightpuzzle_move.py. The tiles are split into
+disjoint groups. For each group a table holds, for every placement of its
+tiles, the fewest moves of *those* tiles needed to bring them home, with moves
+of the other tiles free. Since no move is counted by two groups, the sum over
+the groups never overestimates: AdditivePDB is an admissible heuristic and at
+least as strong as Manhattan distance.
+
+A table is built by 0-1 breadth-first search backwards from the goal over
+abstract states (positions of the group's tiles plus the blank), then
+minimised over the blank. Placements are indexed by their rank as partial
+permutations of the cells, so a table is a bytearray of
+width²!/(width²-k)! entries for a group of k tiles. Given a directory, tables
+are saved there and, on later runs, memory-mapped from disk on first lookup
+instead of being rebuilt.
+
+    pdb = AdditivePDB(width=3, directory="pdb")
+    path = idastar.ida_star(start, standard_moves, goal_test, pdb)
+
+For packed 8-puzzle boards use lambda s: pdb(packed8.unpack(s)). The default
+15-puzzle groups (5-5-5) take about a minute each to build.
+"""
+import os
+import mmap
+from collections import deque
+from math import perm
+
+from utils.atomicFile import atomic_write
+
+
+UNKNOWN = 255
+
+DEFAULT_GROUPS = {
+    3: ((1,2,3,4), (5,6,7,8)),
+    4: ((1,2,3,4,5), (6,7,8,9,10), (11,12,13,14,15)),
+}
+
+
+def default_goal(width):
+    return list(range(1, width*width))+[0]
+
+
+def neighbours(width):
+    cells = []
+    for cell in range(width*width):
+        row, col = divmod(cell, width)
+        adjacent = []
+        if row > 0:
+            adjacent.append(cell-width)
+        if row < width-1:
+            adjacent.append(cell+width)
+        if col > 0:
+            adjacent.append(cell-1)
+        if col < width-1:
+            adjacent.append(cell+1)
+        cells.append(tuple(adjacent))
+    return cells
+
+
+def rank(positions, cells):
+    """Index of a placement of len(positions) distinct cells among `cells`, in
+    0 .. perm(cells, len(positions))-1 (mixed-radix Lehmer code)."""
+    r = 0
+    for i, p in enumerate(positions):
+        smaller = p
+        for q in positions[:i]:
+            if q < p:
+                smaller -= 1
+        r = r*(cells-i)+smaller
+    return r
+
+
+def build_table(tiles, width, goal):
+    cells = width*width
+    k = len(tiles)
+    home = [0]*cells
+    for cell, tile in enumerate(goal):
+        home[tile] = cell
+    adjacent = neighbours(width)
+
+    # abstract state: positions of the group's tiles, then of the blank
+    start = tuple(home[t] for t in tiles)+(home[0],)
+    dist = bytearray([UNKNOWN])*perm(cells, k+1)
+    dist[rank(start, cells)] = 0
+    queue = deque([start])
+    while queue:
+        state = queue.popleft()
+        d = dist[rank(state, cells)]
+        blank = state[-1]
+        for cell in adjacent[blank]:
+            if cell in state[:-1]:
+                i = state.index(cell)
+                child = state[:i]+(blank,)+state[i+1:-1]+(cell,)
+                cost = 1
+            else:
+                child = state[:-1]+(cell,)
+                cost = 0
+            r = rank(child, cells)
+            if d+cost < dist[r]:
+                dist[r] = d+cost
+                if cost:
+                    queue.append(child)
+                else:
+                    queue.appendleft(child)
+
+    # the blank is the last (fastest varying) digit of the rank, so the entries
+    # of one placement of the tiles are consecutive
+    blanks = cells-k
+    return bytearray(min(dist[i:i+blanks]) for i in range(0, len(dist), blanks))
+
+
+class PatternDatabase:
+    """Table for one group of tiles, built or mapped from `path` on first use."""
+
+    def __init__(self, tiles, width=3, goal=None, path=None):
+        self.tiles = tuple(tiles)
+        self.width = width
+        self.cells = width*width
+        self.goal = list(goal) if goal is not None else default_goal(width)
+        self.path = path
+        self._table = None
+        self._file = None
+
+    @property
+    def table(self):
+        if self._table is None:
+            if self.path is not None and os.path.exists(self.path):
+                self._file = open(self.path, "rb")
+                self._table = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._table = build_table(self.tiles, self.width, self.goal)
+                if self.path is not None:
+                    self.save(self.path)
+        return self._table
+
+    def save(self, path):
+        with atomic_write(path) as f:
+            f.write(self.table)
+
+    def lookup(self, where):
+        """Moves of this group's tiles; where[tile] is the cell of every tile."""
+        return self.table[rank([where[t] for t in self.tiles], self.cells)]
+
+    def close(self):
+        if self._file is not None:
+            self._table.close()
+            self._file.close()
+            self._table = None
+            self._file = None
+
+
+class AdditivePDB:
+    """Sum of disjoint pattern databases, usable as heuristic(board).
+
+    groups must not share tiles and must not contain the blank; they default
+    to DEFAULT_GROUPS[width]. Tables are kept in `directory` when given (one
+    directory per goal board).
+    """
+
+    def __init__(self, groups=None, width=3, goal=None, directory=None):
+        if groups is None:
+            groups = DEFAULT_GROUPS[width]
+        seen = [t for tiles in groups for t in tiles]
+        if len(seen) != len(set(seen)) or 0 in seen:
+            raise ValueError("pattern groups must be disjoint and must not contain the blank")
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self.cells = width*width
+        self.databases = []
+        for tiles in groups:
+            path = None
+            if directory is not None:
+                name = f"pdb_{width}x{width}_{'-'.join(map(str, tiles))}.bin"
+                path = os.path.join(directory, name)
+            self.databases.append(PatternDatabase(tiles, width, goal, path))
+
+    def __call__(self, board):
+        where = [0]*self.cells
+        for cell, tile in enumerate(board):
+            where[tile] = cell
+        return sum(database.lookup(where) for database in self.databases)
+
+    def close(self):
+        for database in self.databases:
+            database.close()
@@ -1,29 +1,106 @@
-def best(nodes, heuristic, beam_width):
+import heapq
+import math
+import random
+from collections import deque
+
+from utils.stateKey import resolve_key
+from utils.searchStats import reports_stats
+from utils.heuristicCache import resolve_cache
+
+
+def best(nodes, scores, beam_width):
+    """The beam_width lowest scored nodes as (score, node) pairs, best first.
+
+    Partial selection instead of a full sort; equal scores keep the order of
+    nodes. scores with an argpartition method (a NumPy array from a batched
+    heuristic) are selected with it."""
     if not nodes:
         return []
-    # print(f"Best nodes from {nodes}")
-    nodes.sort(key=lambda x: heuristic(x))
     beam_width=min(beam_width,len(nodes))
-    return nodes[:beam_width]
+    if hasattr(scores,"argpartition") and beam_width<len(nodes):
+        chosen=sorted(scores.argpartition(beam_width-1)[:beam_width].tolist(), key=lambda i: (scores[i], i))
+    else:
+        chosen=heapq.nsmallest(beam_width, range(len(nodes)), key=scores.__getitem__)
+    return [(scores[i], nodes[i]) for i in chosen]
 
 
+def sample(nodes, scores, beam_width, temperature, rng):
+    """Stochastic beam: beam_width nodes drawn without replacement, each with
+    weight exp(-(score-min)/temperature), as (score, node) pairs, best first.
+    Uses the u**(1/weight) keys of Efraimidis and Spirakis, so it is one pass
+    plus a partial selection. The keys are ranked in their Gumbel form
+    -log(-log u) + log(weight), so no weight is ever exponentiated."""
+    if not nodes:
+        return []
+    low=min(scores)
+    keys=[]
+    for score in scores:
+        u=rng.random() or 1e-300
+        keys.append(-math.log(-math.log(u))-(score-low)/temperature)
+    chosen=heapq.nlargest(min(beam_width,len(nodes)), range(len(nodes)), key=keys.__getitem__)
+    return sorted(((scores[i], nodes[i]) for i in chosen), key=lambda pair: pair[0])
+
+
+@reports_stats(movegen="movegen", heuristic=("heuristic", "batch_heuristic"))
+def beamSearch(start_node, movegen, heuristic, beam_width=3,max_steps=100,stats=None,cache=None,
+               batch_heuristic=None,key=None,closed_limit=None,stochastic=False,temperature=1.0,rng=None,verbose=False):
+    """Beam search keeping the beam_width best children of the whole beam at
+    every step; returns the best node seen.
+
+    batch_heuristic(nodes) may score a whole list of children in one call
+    (e.g. NumPy-backed) instead of heuristic(node) per child. Children whose
+    key was seen before are dropped; closed_limit caps that memory by
+    forgetting the oldest keys first. With stochastic=True the next beam is
+    sampled with probability falling off as exp(-(h-h_min)/temperature)
+    instead of taking the best children, using rng (default: random).
+    """
+    heuristic=resolve_cache(heuristic,cache)
+    key=resolve_key(key)
+    rng=rng or random
+
+    def score(nodes):
+        if batch_heuristic is not None:
+            return batch_heuristic(nodes)
+        return [heuristic(node) for node in nodes]
+
+    def select(nodes):
+        if stochastic:
+            return sample(nodes,score(nodes),beam_width,temperature,rng)
+        return best(nodes,score(nodes),beam_width)
 
-def beamSearch(start_node, movegen, heuristic, beam_width=3,max_steps=100):
-    bestNode=start_node
-    bestNodes=best(movegen(start_node),heuristic,beam_width)
     closed=set()
-    closed.add(tuple(start_node))
+    order=deque()  # keys in the order they were added, for closed_limit
+
+    def remember(state_key):
+        closed.add(state_key)
+        if closed_limit is not None:
+            order.append(state_key)
+            if len(order)>closed_limit:
+                closed.discard(order.popleft())
+
+    bestNode=start_node
+    bestScore=score([start_node])[0]
+    remember(key(start_node))
+    beam=select(movegen(start_node))
     step=0
-    while bestNodes and step<max_steps:
+    while beam and step<max_steps:
         step+=1
-        print(f"Step: {step} Exploring Nodes: {bestNodes} with best heuristic {heuristic(bestNodes[0])}")
+        if verbose:
+            print(f"Step: {step} beam of {len(beam)} nodes with best heuristic {beam[0][0]}")
         childrens=[]
-        for node in bestNodes:
-            childrens.extend(movegen(node))
-        childrens=[child for child in childrens if tuple(child) not in closed]
-        for child in childrens:
-            closed.add(tuple(child))
-        bestNodes=best(childrens,heuristic,beam_width)
-        if bestNodes and heuristic(bestNodes[0])<heuristic(bestNode):
-            bestNode=bestNodes[0]
-    return bestNode
\ No newline at end of file
+        generated=0
+        for _,node in beam:
+            for child in movegen(node):
+                generated+=1
+                child_key=key(child)
+                if child_key not in closed:
+                    remember(child_key)
+                    childrens.append(child)
+        if stats is not None:
+            stats.duplicates_pruned+=generated-len(childrens)
+        beam=select(childrens)
+        if stats is not None:
+            stats.observe(len(beam),len(closed))
+        if beam and beam[0][0]<bestScore:
+            bestScore,bestNode=beam[0]
+    return bestNode
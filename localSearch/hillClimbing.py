@@ -1,17 +1,77 @@
+from operator import attrgetter
+
+from utils.searchStats import reports_stats
+from utils.heuristicCache import resolve_cache
+
+
 def best(nodes, heuristic):
-    if not nodes:
-        return []
-    # print(f"Best nodes from {nodes}")
-    nodes.sort(key=lambda x: heuristic(x))
-    return nodes[0]
+    # min keeps the first of equal nodes, as the stable sort did, and takes generators
+    return min(nodes, key=heuristic, default=[])
+
+
+def first_better(nodes, heuristic, h):
+    """The first node scoring below h, or None; a generator is not consumed further."""
+    for node in nodes:
+        if heuristic(node)<h:
+            return node
+    return None
+
+
+def best_move(moves):
+    """The move with the lowest delta, the first one on ties, or None."""
+    return min(moves, key=attrgetter("delta"), default=None)
+
+
+def first_improving(moves):
+    """The first move with a negative delta, or None."""
+    for move in moves:
+        if move.delta<0:
+            return move
+    return None
+
 
+@reports_stats(movegen=("movegen", "moves"), heuristic="heuristic")
+def hillClimbing(start_node, movegen, heuristic, stats=None, cache=None, moves=None, first_improvement=False, verbose=True):
+    """Steepest ascent hill climbing.
 
+    moves(node), instead of movegen, may list the neighbourhood as move
+    objects with a cost change move.delta and move.apply(node) building the
+    neighbour (see extra/movegen/tsp_move.py). heuristic is then evaluated for
+    start_node only and only the chosen neighbour is built.
 
-def hillClimbing(start_node, movegen, heuristic):
+    With first_improvement=True the climb takes the first better neighbour
+    instead of the best one and stops scanning there, so a lazy movegen or
+    moves (a generator such as tsp_move.iter_two_opt) is only consumed up to
+    that neighbour. verbose=False keeps the climb from printing every node."""
+    heuristic=resolve_cache(heuristic, cache)
+    if moves is not None:
+        pick=first_improving if first_improvement else best_move
+        bestNode=start_node
+        cost=heuristic(start_node)
+        move=pick(moves(bestNode))
+        while move is not None and move.delta<0:
+            if verbose:
+                print(f"Exploring Node with heuristic {cost}: {bestNode}")
+            bestNode=move.apply(bestNode)
+            cost+=move.delta
+            move=pick(moves(bestNode))
+        return bestNode
+    if first_improvement:
+        bestNode=start_node
+        cost=heuristic(start_node)
+        nextNode=first_better(movegen(bestNode),heuristic,cost)
+        while nextNode is not None:
+            if verbose:
+                print(f"Exploring Node with heuristic {cost}: {bestNode}")
+            bestNode=nextNode
+            cost=heuristic(bestNode)
+            nextNode=first_better(movegen(bestNode),heuristic,cost)
+        return bestNode
     bestNode=start_node
     nextNode=best(movegen(start_node),heuristic)
     while nextNode and heuristic(nextNode)<heuristic(bestNode):
-        print(f"Exploring Node with heuristic {heuristic(bestNode)}: {bestNode}")
+        if verbose:
+            print(f"Exploring Node with heuristic {heuristic(bestNode)}: {bestNode}")
         bestNode=nextNode
         nextNode=best(movegen(bestNode),heuristic)
     return bestNode
\ No newline at end of file
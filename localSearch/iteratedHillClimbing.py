@@ -1,29 +1,19 @@
-def best(nodes, heuristic):
-    if not nodes:
-        return []
-    # print(f"Best nodes from {nodes}")
-    nodes.sort(key=lambda x: heuristic(x))
-    return nodes[0]
+from utils.searchStats import reports_stats
+from utils.heuristicCache import resolve_cache
+from localSearch.hillClimbing import hillClimbing
 
 
-
-def hillClimbing(start_node, movegen, heuristic, verbose=False):
-    bestNode=start_node
-    nextNode=best(movegen(start_node),heuristic)
-    while nextNode and heuristic(nextNode)<heuristic(bestNode):
-        if verbose:
-            print(f"Exploring Node with heuristic {heuristic(bestNode)}: {bestNode}")
-        bestNode=nextNode
-        nextNode=best(movegen(bestNode),heuristic)
-    return bestNode
-
-
-def iteratedHillClimbing(movegen, heuristic, node_generator, max_attempts=10, verbose=False):
+@reports_stats(movegen=("movegen", "moves"), heuristic="heuristic")
+def iteratedHillClimbing(movegen, heuristic, node_generator, max_attempts=10, verbose=False, stats=None, cache=None, moves=None, first_improvement=False):
+    heuristic=resolve_cache(heuristic, cache)
     best_node = node_generator()
     for k in range(max_attempts):
         start_node = node_generator()
         print(f"\nStarting new iteration: {k} with start node {start_node} and cost {heuristic(start_node)}")
-        current_best=hillClimbing(start_node, movegen, heuristic, verbose)
+        expanded=stats.nodes_expanded if stats is not None else 0
+        current_best=hillClimbing(start_node, movegen, heuristic, moves=moves, first_improvement=first_improvement, verbose=verbose)
+        if stats is not None:
+            stats.iterations.append({"attempt": k, "nodes_expanded": stats.nodes_expanded-expanded, "cost": heuristic(current_best)})
         if heuristic(current_best)<heuristic(best_node):
             best_node=current_best
     return best_node
\ No newline at end of file
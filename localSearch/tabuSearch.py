@@ -1,20 +1,109 @@
-def best(nodes, heuristic):
-    if not nodes:
-        return []
-    # print(f"Best nodes from {nodes}")
-    nodes.sort(key=lambda x: heuristic(x))
-    return nodes[0]
-
-
-def tabuSearch(start_node,movegen,heuristic,max_iteration=1000):
-    bestNode=start_node
-    tabuList=set()
-    tabuList.add(tuple(bestNode))
+from utils.searchStats import reports_stats
+from utils.heuristicCache import resolve_cache
+
+
+class TabuList:
+    """Attributes given up by the last `tenure` accepted moves.
+
+    The moves sit in a ring buffer of tenure slots, so the oldest move's
+    attributes are released when a new one comes in; a count per attribute
+    makes membership O(1)."""
+
+    def __init__(self, tenure):
+        self.ring=[()]*tenure
+        self.next=0
+        self.count={}
+
+    def add(self, attributes):
+        if not self.ring:
+            return
+        count=self.count
+        for attribute in self.ring[self.next]:
+            if count[attribute]==1:
+                del count[attribute]
+            else:
+                count[attribute]-=1
+        attributes=tuple(attributes)
+        for attribute in attributes:
+            count[attribute]=count.get(attribute,0)+1
+        self.ring[self.next]=attributes
+        self.next=(self.next+1)%len(self.ring)
+
+    def forbids(self, attributes):
+        count=self.count
+        return any(attribute in count for attribute in attributes)
+
+    def __len__(self):
+        return len(self.count)
+
+
+def changed_positions(node, child):
+    """(gained, lost) attributes of a move between list-like states: the
+    (index, value) pairs of child and of node where the two differ."""
+    gained=[]
+    lost=[]
+    for i,(old,new) in enumerate(zip(node,child)):
+        if old!=new:
+            gained.append((i,new))
+            lost.append((i,old))
+    return gained,lost
+
+
+@reports_stats(movegen=("movegen","moves"),heuristic="heuristic")
+def tabuSearch(start_node,movegen,heuristic,max_iteration=1000,stats=None,cache=None,moves=None,
+               tenure=7,attributes=changed_positions,verbose=False):
+    """Tabu search; returns the best node seen.
+
+    Every iteration moves to the best neighbour that is not tabu, even when
+    it is worse than the current node. A move is tabu when it regains an
+    attribute that one of the last `tenure` moves gave up, unless it beats
+    the best node so far (aspiration). attributes(node, child) gives the
+    (gained, lost) attributes of a move; the default compares list-like
+    states position by position, so undoing a recent change is tabu.
+
+    moves(node) may replace movegen with move objects (move.delta,
+    move.apply(node); see localSearch/hillClimbing.py). Their own
+    move.attributes(node) is used then, for tsp_move the edges added and
+    removed, and no neighbour is built before it is chosen."""
+    heuristic=resolve_cache(heuristic,cache)
+    tabu=TabuList(tenure)
+    current=start_node
+    cost=heuristic(current)
+    bestNode,bestCost=current,cost
     for k in range(max_iteration):
-        allowedNodes=[node for node in movegen(bestNode) if tuple(node) not in tabuList]
-        nextNode=best(allowedNodes,heuristic)
-        print(f"Iteration {k}, Exploring Node with heuristic {heuristic(nextNode)}: {nextNode}")
-        if nextNode and heuristic(nextNode)<heuristic(bestNode):
-            bestNode=nextNode
-            tabuList.add(tuple(bestNode))
-    return bestNode
\ No newline at end of file
+        chosen=None
+        chosenCost=float("inf")
+        skipped=0
+        if moves is not None:
+            for move in moves(current):
+                newCost=cost+move.delta
+                # attributes are only looked at for a move that would be chosen
+                if newCost<chosenCost:
+                    gained,lost=move.attributes(current)
+                    if newCost>=bestCost and tabu.forbids(gained):
+                        skipped+=1
+                        continue
+                    chosen,chosenCost,chosenLost=move,newCost,lost
+            if chosen is not None:
+                chosen=chosen.apply(current)
+        else:
+            for child in movegen(current):
+                newCost=heuristic(child)
+                if newCost<chosenCost:
+                    gained,lost=attributes(current,child)
+                    if newCost>=bestCost and tabu.forbids(gained):
+                        skipped+=1
+                        continue
+                    chosen,chosenCost,chosenLost=child,newCost,lost
+        if stats is not None:
+            stats.duplicates_pruned+=skipped
+            stats.observe(0,len(tabu))
+        if chosen is None:
+            break
+        tabu.add(chosenLost)
+        current,cost=chosen,chosenCost
+        if cost<bestCost:
+            bestNode,bestCost=current,cost
+            if verbose:
+                print(f"Iteration {k}, new best heuristic {cost}: {current}")
+    return bestNode
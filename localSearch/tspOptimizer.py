@@ -0,0 +1,168 @@
+"""2-opt and Or-opt for TSP tours with candidate lists and don't-look bits.
+
+A full 2-opt scan looks at every pair of edges for each improvement. Here each
+city only tries edges to its k nearest neighbours (candidate_lists, computed
+once from the distance matrix), and a city is only looked at again once an
+edge next to it has changed (the don't-look bits: a queue of active cities).
+The tour is an array with a position index, a 2-opt move reverses the shorter
+side of the cycle and an Or-opt move (a segment of 1 to 3 cities moved next to
+a candidate neighbour, in either orientation) is done as two or three such
+exchanges.
+
+dist[a][b] is any symmetric matrix indexed by city, e.g. tsp_move.city_matrix
+for the 1-based cities of Problems/tsp.py and ACO/aco.py:
+
+    neighbours = candidate_lists(dist, start_node, k=8)
+    tour = optimize_tour(start_node, dist, neighbours)
+
+The result starts with the same city as the input tour. Started from a random
+tour the optimum reached is poor on large instances; nearest_neighbour_tour
+gives a far better start at about the same cost as one optimize_tour pass.
+"""
+import heapq
+from collections import deque
+
+EPSILON = 1e-9
+
+
+def candidate_lists(dist, cities, k=8):
+    """{city: its k nearest other cities in `cities`, nearest first}."""
+    cities = list(cities)
+    neighbours = {}
+    for a in cities:
+        nearest = heapq.nsmallest(k+1, cities, key=dist[a].__getitem__)
+        neighbours[a] = [b for b in nearest if b != a][:k]
+    return neighbours
+
+
+def nearest_neighbour_tour(dist, cities, neighbours, start=None):
+    """Greedy tour from start (default: the first city): always on to the
+    nearest unvisited candidate, or the nearest unvisited city if all
+    candidates are taken."""
+    cities = list(cities)
+    city = cities[0] if start is None else start
+    unvisited = set(cities)
+    unvisited.discard(city)
+    tour = [city]
+    while unvisited:
+        following = next((c for c in neighbours[city] if c in unvisited), None)
+        if following is None:
+            following = min(unvisited, key=dist[city].__getitem__)
+        unvisited.discard(following)
+        tour.append(following)
+        city = following
+    return tour
+
+
+def optimize_tour(tour, dist, neighbours=None, k=8, or_opt=True):
+    """A tour that no 2-opt or Or-opt move along a candidate edge improves."""
+    n = len(tour)
+    if n < 5:
+        return tour[:]
+    if neighbours is None:
+        neighbours = candidate_lists(dist, tour, k)
+    start = tour[0]
+    tour = tour[:]
+    pos = {city: i for i, city in enumerate(tour)}
+
+    def succ(city):
+        i = pos[city]+1
+        return tour[i if i < n else 0]
+
+    def pred(city):
+        return tour[pos[city]-1]
+
+    def reverse(x, y):
+        # reverse the path from x forward to y, or the rest of the cycle if
+        # that is shorter: the same cycle, only its orientation differs
+        i, j = pos[x], pos[y]
+        length = (j-i) % n+1
+        if 2*length > n:
+            i, j = (j+1) % n, (i-1) % n
+            length = n-length
+        for _ in range(length//2):
+            ci, cj = tour[i], tour[j]
+            tour[i] = cj
+            pos[cj] = i
+            tour[j] = ci
+            pos[ci] = j
+            i += 1
+            if i == n:
+                i = 0
+            j -= 1
+            if j < 0:
+                j = n-1
+
+    def exchange(a, b, c, d):
+        # edges a-b and c-d, oriented the same way, become a-c and b-d
+        if succ(a) == b:
+            reverse(b, c)
+        else:
+            reverse(a, d)
+
+    def two_opt(a):
+        row_a = dist[a]
+        for forward in (True, False):
+            b = succ(a) if forward else pred(a)
+            d_ab = row_a[b]
+            for c in neighbours[a]:
+                d_ac = row_a[c]
+                if d_ac >= d_ab:
+                    break
+                d = succ(c) if forward else pred(c)
+                if d == a:
+                    continue
+                if d_ac+dist[b][d]-d_ab-dist[c][d] < -EPSILON:
+                    exchange(a, b, c, d)
+                    return (a, b, c, d)
+        return None
+
+    def or_opt_move(a):
+        row_a = dist[a]
+        for length in (1, 2, 3):
+            if n < length+3:
+                break
+            for forward in ((True,) if length == 1 else (True, False)):
+                # the segment first..last (in tour order) has a at one end
+                segment = [a]
+                for _ in range(length-1):
+                    segment.append(succ(segment[-1]) if forward else pred(segment[-1]))
+                first, last = (a, segment[-1]) if forward else (segment[-1], a)
+                other = segment[-1] if length > 1 else a
+                p, nx = pred(first), succ(last)
+                removed = dist[p][first]+dist[last][nx]-dist[p][nx]
+                if removed <= EPSILON:
+                    continue
+                for c in neighbours[a]:
+                    d_ac = row_a[c]
+                    if d_ac >= removed:
+                        break
+                    if c in segment:
+                        continue
+                    for u, v in ((c, succ(c)), (pred(c), c)):
+                        if u in segment or v in segment:
+                            continue
+                        e = v if u == c else u
+                        if d_ac+dist[other][e]-dist[u][v]-removed < -EPSILON:
+                            # u-first..last-v (same orientation) or u-last..first-v
+                            same = (u == c) == (a == first)
+                            exchange(last, nx, u, v)
+                            exchange(p, first, nx, v)
+                            if same and first != last:
+                                exchange(u, last, first, v)
+                            return (p, nx, first, last, u, v)
+        return None
+
+    queue = deque(tour)
+    queued = set(tour)
+    while queue:
+        a = queue.popleft()
+        queued.discard(a)
+        changed = two_opt(a) or (or_opt and or_opt_move(a))
+        if changed:
+            for city in changed:
+                if city not in queued:
+                    queued.add(city)
+                    queue.append(city)
+    i = pos[start]
+    return tour[i:]+tour[:i]
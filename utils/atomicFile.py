@@ -0,0 +1,13 @@
+"""Crash-safe file writes for the tables and layers kept on disk."""
+import os
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_write(path, mode="wb"):
+    """Write to path+".tmp" and rename it over path once the block completes,
+    so a crash never leaves a truncated or half written file at path."""
+    tmp = path+".tmp"
+    with open(tmp, mode) as f:
+        yield f
+    os.replace(tmp, path)
@@ -0,0 +1,78 @@
+"""Memoizing cache for expensive heuristics.
+
+Local and stochastic search evaluate the same states over and over (sorting
+neighbours by h, then h of the winner and of the current node again, or h of
+the current node on every proposal). HeuristicCache remembers h by state key
+and evicts the least recently used entry once maxsize entries are held.
+
+The localSearch and Stochastic entry points take cache=:
+    None   no caching (default)
+    True   a new HeuristicCache for this call
+    int    a new HeuristicCache of that size
+    a HeuristicCache instance, to share it across calls or read its counters
+
+    cache = HeuristicCache(maxsize=50000)
+    tour = hillclimbing.hillClimbing(start, movegen, heuristic, cache=cache)
+    print(cache)  # hits, misses, evictions
+"""
+from collections import OrderedDict
+
+from utils.stateKey import resolve_key
+
+
+class HeuristicCache:
+    def __init__(self, heuristic=None, maxsize=100000, key=None):
+        self.heuristic = heuristic
+        self.maxsize = maxsize
+        self.key = resolve_key(key)
+        self.values = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def bind(self, heuristic):
+        """Use this cache for `heuristic`. The entries are kept, so one cache
+        must only ever serve one heuristic."""
+        self.heuristic = heuristic
+        return self
+
+    def __call__(self, state):
+        state_key = self.key(state)
+        values = self.values
+        if state_key in values:
+            self.hits += 1
+            values.move_to_end(state_key)
+            return values[state_key]
+        self.misses += 1
+        value = self.heuristic(state)
+        values[state_key] = value
+        if len(values) > self.maxsize:
+            values.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def __len__(self):
+        return len(self.values)
+
+    def clear(self):
+        self.values.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def hit_rate(self):
+        lookups = self.hits+self.misses
+        return self.hits/lookups if lookups else 0.0
+
+    def __repr__(self):
+        return (f"HeuristicCache(size={len(self.values)}/{self.maxsize}, hits={self.hits}, "
+                f"misses={self.misses}, evictions={self.evictions}, hit rate={self.hit_rate():.1%})")
+
+
+def resolve_cache(heuristic, cache):
+    """The heuristic an engine should call for its cache= argument."""
+    if cache is None or cache is False:
+        return heuristic
+    if cache is True:
+        return HeuristicCache(heuristic)
+    if isinstance(cache, HeuristicCache):
+        return cache.bind(heuristic)
+    return HeuristicCache(heuristic, maxsize=cache)
@@ -0,0 +1,74 @@
+"""Array-backed node store for the path-building searches.
+
+Each state is interned once and gets an integer id (its insertion index). The
+per-node data lives in flat `array` columns indexed by that id instead of one
+tuple or dict entry per node:
+
+    parent[id]  id of the parent node, -1 for the root
+    g[id]       path cost from the root (only when costs=True)
+
+The planning engines intern every generated state with its parent id when it
+is first seen, so the one table (ids) answers "child in open or closed" and
+also rebuilds the path. Path reconstruction walks parent ids and touches no
+hash table. Only one
+object per node is kept: the state when it is its own key, otherwise the key,
+turned back into the state by decode when a path is rebuilt. With the default
+state_key the decode for list and set states (key_state) is picked up from the
+first state added, when it gives that state back; a custom key that does not
+return the state itself needs its own decode, or each node keeps both.
+"""
+from array import array
+
+from utils.stateKey import resolve_key, state_key as default_key, key_state
+
+
+class NodeStore:
+    def __init__(self, key=None, decode=None, costs=False):
+        self.key = resolve_key(key)
+        self.decode = decode
+        self.ids = {}          # state key -> id
+        self.items = []        # id -> state, or key when decode is given
+        self.parent = array('i')
+        self.g = array('d') if costs else None
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, state_key):
+        return state_key in self.ids
+
+    def get(self, state_key):
+        """Id of an interned key, or None."""
+        return self.ids.get(state_key)
+
+    def add(self, state, state_key, parent_id=-1, g=0):
+        """Intern a state that is not in the store yet and return its id."""
+        items = self.items
+        node_id = len(items)
+        if not node_id and self.decode is None and self.key is default_key \
+                and state_key is not state and key_state(state_key) == state:
+            self.decode = key_state
+        self.ids[state_key] = node_id
+        items.append(state if self.decode is None else state_key)
+        self.parent.append(parent_id)
+        if self.g is not None:
+            self.g.append(g)
+        return node_id
+
+    def relink(self, node_id, parent_id, g=0):
+        """Give a node a new parent (and cost), e.g. when A* finds a cheaper path."""
+        self.parent[node_id] = parent_id
+        if self.g is not None:
+            self.g[node_id] = g
+
+    def state(self, node_id):
+        item = self.items[node_id]
+        return item if self.decode is None else self.decode(item)
+
+    def path(self, node_id):
+        """States from the root to node_id."""
+        ids = []
+        while node_id >= 0:
+            ids.append(node_id)
+            node_id = self.parent[node_id]
+        return [self.state(i) for i in reversed(ids)]
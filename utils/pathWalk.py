@@ -0,0 +1,42 @@
+"""Depth-first walk that keeps only the current path.
+
+The depth-first engines that must run in O(b*depth) memory (dfs_all, the
+planning dls, IDA*'s bounded search, AO*'s marked-arc trace) hold one iterator
+over the children of every node on the current path instead of an open list:
+
+    walk = PathWalk(movegen(start), backtrack)
+    for child in walk:
+        ...                          # skip child, stop, or
+        walk.descend(movegen(child)) # go one level deeper
+
+The loop yields the next child of the deepest node. When that node's children
+are exhausted its iterator is dropped and backtrack() is called, so the caller
+can pop whatever it keeps per level (the path, keys, g values); this also
+happens once for the root when the walk ends.
+"""
+
+
+class PathWalk:
+    def __init__(self, children, backtrack=None):
+        self.stack = [iter(children)]
+        self.backtrack = backtrack
+
+    def __len__(self):
+        return len(self.stack)
+
+    def descend(self, children):
+        """Continue the walk with these children of the child just yielded."""
+        self.stack.append(iter(children))
+
+    def __iter__(self):
+        stack = self.stack
+        backtrack = self.backtrack
+        while stack:
+            # the stack itself is never a child, so it marks exhaustion
+            child = next(stack[-1], stack)
+            if child is stack:
+                stack.pop()
+                if backtrack is not None:
+                    backtrack()
+                continue
+            yield child
@@ -0,0 +1,174 @@
+"""Search statistics shared by the engines.
+
+Engines decorated with @reports_stats take an optional stats= keyword. Without
+it they run exactly as before and return their usual result. With stats=True
+(or a SearchStats instance to accumulate into) the decorator wraps the
+callbacks named in the decorator with timers/counters, times the whole call and
+returns (result, stats):
+
+    path, stats = bfs_planning.bfs_closed(start, movegen, goal_test, stats=True)
+    print(stats)
+
+Counted by the wrappers, so engines need no code for them:
+    nodes_expanded      movegen calls
+    nodes_generated     children returned by movegen
+    time["movegen"], time["goal_test"], time["heuristic"]
+
+Callbacks under the timer name "sample" draw one random neighbour or move per
+call (random_neighbor, random_move): each call counts as an expansion
+generating one node and is timed under time["movegen"].
+
+Reported by the engine itself, once per expansion (or per duplicate), through
+`if stats is not None:` checks:
+    duplicates_pruned   children dropped because their state was already known
+    peak_frontier, peak_closed
+    iterations          one dict per iteration for iterative engines
+
+time["frontier"] is the wall time not spent in callbacks, i.e. everything the
+engine does itself: frontier operations, open/closed tables and bookkeeping.
+"""
+import inspect
+import functools
+from time import perf_counter
+
+
+class SearchStats:
+    def __init__(self):
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.duplicates_pruned = 0
+        self.peak_frontier = 0
+        self.peak_closed = 0
+        self.wall_time = 0.0
+        self.time = {"movegen": 0.0, "goal_test": 0.0, "heuristic": 0.0, "frontier": 0.0}
+        self.iterations = []
+
+    def observe(self, frontier_size, closed_size=0):
+        if frontier_size > self.peak_frontier:
+            self.peak_frontier = frontier_size
+        if closed_size > self.peak_closed:
+            self.peak_closed = closed_size
+
+    def timed(self, fn, name):
+        """Wrap a callback so its time is added to self.time[name]."""
+        times = self.time
+        if name == "movegen":
+            return self.timed_movegen(fn)
+        if name == "sample":
+            return self.timed_sample(fn)
+        times.setdefault(name, 0.0)
+
+        def timed_fn(*args):
+            start = perf_counter()
+            value = fn(*args)
+            times[name] += perf_counter()-start
+            return value
+        return timed_fn
+
+    def timed_movegen(self, movegen):
+        times = self.time
+
+        def timed_movegen(*args):
+            start = perf_counter()
+            children = movegen(*args)
+            times["movegen"] += perf_counter()-start
+            self.nodes_expanded += 1
+            if hasattr(children, "__len__"):
+                self.nodes_generated += len(children)
+                return children
+            return self.counted(children)
+        return timed_movegen
+
+    def timed_sample(self, sample):
+        times = self.time
+
+        def timed_sample(*args):
+            start = perf_counter()
+            child = sample(*args)
+            times["movegen"] += perf_counter()-start
+            self.nodes_expanded += 1
+            if child is not None:
+                self.nodes_generated += 1
+            return child
+        return timed_sample
+
+    def counted(self, children):
+        # lazy neighbourhoods: count (and time) children as they are consumed
+        times = self.time
+        iterator = iter(children)
+        while True:
+            start = perf_counter()
+            child = next(iterator, iterator)
+            times["movegen"] += perf_counter()-start
+            if child is iterator:
+                return
+            self.nodes_generated += 1
+            yield child
+
+    def finish(self, elapsed):
+        self.wall_time += elapsed
+        callbacks = sum(t for name, t in self.time.items() if name != "frontier")
+        self.time["frontier"] = max(0.0, self.wall_time-callbacks)
+
+    def as_dict(self):
+        return {
+            "nodes_expanded": self.nodes_expanded,
+            "nodes_generated": self.nodes_generated,
+            "duplicates_pruned": self.duplicates_pruned,
+            "peak_frontier": self.peak_frontier,
+            "peak_closed": self.peak_closed,
+            "wall_time": self.wall_time,
+            "time": dict(self.time),
+            "iterations": list(self.iterations),
+        }
+
+    def __repr__(self):
+        lines = [
+            f"nodes expanded:    {self.nodes_expanded}",
+            f"nodes generated:   {self.nodes_generated}",
+            f"duplicates pruned: {self.duplicates_pruned}",
+            f"peak frontier:     {self.peak_frontier}",
+            f"peak closed:       {self.peak_closed}",
+            f"wall time:         {self.wall_time:.4f}s",
+        ]
+        for name, t in self.time.items():
+            share = 100*t/self.wall_time if self.wall_time else 0.0
+            lines.append(f"  {name+':':<17}{t:.4f}s ({share:.1f}%)")
+        return "\n".join(lines)
+
+
+def reports_stats(**callbacks):
+    """Decorator for engines with a stats=None parameter, passed by keyword or
+    position.
+
+    callbacks maps a timer name to the engine parameter holding that callback,
+    e.g. @reports_stats(movegen="movegen", goal_test="goal_test"), or to a tuple
+    of parameters sharing one timer (movegen=("movegen", "predecessors")).
+    """
+    def decorate(engine):
+        signature = inspect.signature(engine)
+        # stats may also be passed positionally
+        position = list(signature.parameters).index("stats")
+
+        @functools.wraps(engine)
+        def run(*args, **kwargs):
+            stats = args[position] if len(args) > position else kwargs.get("stats")
+            if stats is None or stats is False:
+                return engine(*args, **kwargs)
+            if stats is True:
+                stats = SearchStats()
+            bound = signature.bind(*args, **kwargs)
+            bound.arguments["stats"] = stats
+            for name, parameters in callbacks.items():
+                if isinstance(parameters, str):
+                    parameters = (parameters,)
+                for parameter in parameters:
+                    fn = bound.arguments.get(parameter)
+                    if fn is not None:
+                        bound.arguments[parameter] = stats.timed(fn, name)
+            start = perf_counter()
+            result = engine(*bound.args, **bound.kwargs)
+            stats.finish(perf_counter()-start)
+            return result, stats
+        return run
+    return decorate
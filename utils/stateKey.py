@@ -0,0 +1,46 @@
+"""Canonical state keys shared by the search engines.
+
+Every engine accepts an optional key(state) callback. The key is computed once
+per generated node and reused for the open, closed, parent and cost tables, so
+it must be hashable and equal for equal states. Domains with a cheap integer
+encoding (packed boards, bitmasks) can pass their own key, or key=int-identity,
+and skip tuple construction entirely.
+
+A generated state is in open or in closed, never both, so the engines keep one
+set of keys for the two and a single lookup answers "child not in closed and
+child not in open".
+"""
+
+
+def state_key(state):
+    """Default key: lists become tuples (nested lists too), sets become frozensets,
+    anything else is assumed to be hashable already and is used as-is."""
+    if isinstance(state, list):
+        if state and isinstance(state[0], list):
+            return tuple(map(state_key, state))
+        return tuple(state)
+    if isinstance(state, set):
+        return frozenset(state)
+    return state
+
+
+def key_state(state_key):
+    """Inverse of state_key for list and set states: tuples become lists (tuples
+    of tuples nested lists), frozensets become sets."""
+    if isinstance(state_key, tuple):
+        if state_key and isinstance(state_key[0], tuple):
+            return list(map(key_state, state_key))
+        return list(state_key)
+    if isinstance(state_key, frozenset):
+        return set(state_key)
+    return state_key
+
+
+def identity_key(state):
+    """Key for states that are already hashable (ints, strings, tuples)."""
+    return state
+
+
+def resolve_key(key):
+    """Return the key callback to use, falling back to state_key."""
+    return state_key if key is None else key